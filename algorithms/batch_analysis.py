@@ -0,0 +1,124 @@
+import os
+import csv
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from storage.session_file import find_sessions
+from storage.catalog import SessionCatalog, CATALOG_PATH, normalize
+
+CACHE_FILE = "analysis_cache.json"
+SUMMARY_FILE = "sessions_summary.csv"
+SUMMARY_COLUMNS = ["session", "samples", "duration", "start_temp", "min_temp", "max_temp",
+                   "mean_temp", "temper_index", "break_points", "time_below_window",
+                   "time_in_window", "time_above_window", "report"]
+# تغيير أي من هذه الملفات يعني أن كل النتائج القديمة أصبحت قديمة
+ANALYSIS_SOURCES = ["curve_analysis.py", "data_analysis.py", "report_renderer.py"]
+renderers = {}  # قالب رسم واحد لكل عملية عاملة
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def analysis_fingerprint():
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ANALYSIS_SOURCES:
+        digest.update(file_hash(os.path.join(here, name)).encode())
+    return digest.hexdigest()
+
+def report_path(session_path, data_dir, results_dir, fmt="png"):
+    relative = os.path.relpath(os.path.splitext(session_path)[0], data_dir)
+    return os.path.join(results_dir, f"{relative}.{fmt}")
+
+def load_cache(results_dir):
+    try:
+        with open(os.path.join(results_dir, CACHE_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_cache(results_dir, cache):
+    path = os.path.join(results_dir, CACHE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+def analyze_session(session_path, output_path, fmt="png", dpi=150):
+    # يعمل داخل عملية منفصلة؛ الاستيراد هنا حتى لا تحمل العملية الرئيسية matplotlib
+    from algorithms.data_analysis import analyze_and_save
+    from algorithms.report_renderer import ReportRenderer
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if (fmt, dpi) not in renderers:
+        renderers[fmt, dpi] = ReportRenderer(fmt, dpi)
+    result = analyze_and_save(session_path, save_path=output_path, renderer=renderers[fmt, dpi])
+    return None if result is None else result.summary()
+
+def run_batch(data_dir="data", results_dir="results", workers=None, force=False, fmt="png", dpi=150, catalog=None):
+    os.makedirs(results_dir, exist_ok=True)
+    cache = load_cache(results_dir)
+    fingerprint = analysis_fingerprint()
+    pending = {}
+    for session in find_sessions(data_dir):
+        key = os.path.relpath(session, data_dir)
+        output = report_path(session, data_dir, results_dir, fmt)
+        content = file_hash(session)
+        entry = cache.get(key)
+        if (not force and entry and entry["hash"] == content
+                and entry["fingerprint"] == fingerprint and os.path.exists(output)):
+            # the report is current, but a new or quickly imported catalog may not have its numbers yet
+            if catalog is not None and not catalog.known("sessions", "stem", normalize(os.path.splitext(session)[0]),
+                                                         os.stat(session), analyzed=True):
+                catalog.record_analysis(session, entry["summary"], output)
+            continue
+        pending[key] = (session, output, content)
+
+    print(f"[INFO] {len(pending)} session(s) to analyse, {len(cache)} cached")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_session, session, output, fmt, dpi): key
+                   for key, (session, output, _) in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            session, output, content = pending[key]
+            try:
+                summary = future.result()
+            except Exception as e:
+                print(f"[ERROR] {session}: {e}")
+                continue
+            if summary is None:
+                print(f"[ERROR] {session}: empty or unreadable session")
+                continue
+            if catalog is not None:
+                catalog.record_analysis(session, summary, output)
+            summary["report"] = os.path.relpath(output, results_dir)
+            cache[key] = {"hash": content, "fingerprint": fingerprint, "summary": summary}
+    save_cache(results_dir, cache)
+    write_summary(results_dir, cache)
+    return cache
+
+def write_summary(results_dir, cache):
+    path = os.path.join(results_dir, SUMMARY_FILE)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for key in sorted(cache):
+            writer.writerow({"session": key, **cache[key]["summary"]})
+    print(f"[SUCCESS] Summary of {len(cache)} session(s) saved at: {path}")
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-analyse every session under data/")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--results", default="results")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "json"])
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--catalog", default=None, help=f"session catalog to update (default: <data>/{os.path.basename(CATALOG_PATH)})")
+    args = parser.parse_args()
+    catalog = SessionCatalog(args.catalog or os.path.join(args.data, os.path.basename(CATALOG_PATH)))
+    run_batch(args.data, args.results, args.workers, args.force, args.format, args.dpi, catalog)
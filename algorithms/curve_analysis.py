@@ -0,0 +1,145 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+# درجات الحرارة المستهدفة لمنحنى التمبرة (شوكولاتة داكنة)
+MELT_TEMP = 45.0
+COOL_TEMP = 27.0
+WORK_TEMP = 31.0
+WINDOW = (30.0, 32.0)
+
+@dataclass
+class Phase:
+    name: str            # "melt", "cool", "rework" or "hold"
+    start_time: float
+    end_time: float
+    start_temp: float
+    end_temp: float
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+@dataclass
+class CurveAnalysis:
+    samples: int
+    duration: float
+    start_temp: float
+    min_temp: float
+    max_temp: float
+    mean_temp: float
+    temper_index: float
+    smoothed: np.ndarray = field(repr=False)
+    rate: np.ndarray = field(repr=False)          # °C/min of the smoothed curve
+    break_points: np.ndarray = field(repr=False)  # sample indices with a jump > break_threshold
+    phases: list = field(default_factory=list)
+    dwell: dict = field(default_factory=dict)     # seconds within tolerance of each target
+    time_below_window: float = 0.0
+    time_in_window: float = 0.0
+    time_above_window: float = 0.0
+
+    def summary(self):
+        return {
+            "samples": self.samples,
+            "duration": round(self.duration, 2),
+            "start_temp": self.start_temp,
+            "min_temp": self.min_temp,
+            "max_temp": self.max_temp,
+            "mean_temp": round(self.mean_temp, 2),
+            "temper_index": self.temper_index,
+            "break_points": int(len(self.break_points)),
+            "phases": [(p.name, round(p.start_time, 2), round(p.end_time, 2)) for p in self.phases],
+            "dwell": {k: round(v, 2) for k, v in self.dwell.items()},
+            "time_below_window": round(self.time_below_window, 2),
+            "time_in_window": round(self.time_in_window, 2),
+            "time_above_window": round(self.time_above_window, 2),
+        }
+
+def temper_index(mean_temp):
+    """مؤشر الحرارة كقيمة من 0 إلى 10"""
+    return round(max(0, min(10, (mean_temp - 15) / 3.5)), 1)
+
+def analyze_curve(times, values, targets=None, window=WINDOW, tolerance=0.5,
+                  smooth_seconds=5.0, rate_threshold=0.2, min_phase_seconds=10.0,
+                  break_threshold=2.0):
+    """Analyse one session with whole-array NumPy operations.
+
+    ``times`` are seconds, ``values`` °C; both may be memory-mapped. The curve is
+    smoothed with a moving average of ``smooth_seconds``, its slope classifies
+    every sample as heating, cooling or holding (dead band ``rate_threshold``
+    °C/min), and runs shorter than ``min_phase_seconds`` are folded into their
+    neighbour. Heating before the first cool is "melt", heating after it is
+    "rework".
+    """
+    # scipy.ndimage يستغرق نصف ثانية للاستيراد؛ لا نحمله إلا عند أول تحليل
+    from scipy.ndimage import uniform_filter1d
+    t = np.asarray(times, dtype=np.float64)
+    v = np.asarray(values, dtype=np.float64)
+    n = len(v)
+    if n == 0:
+        raise ValueError("Cannot analyse an empty session")
+    if targets is None:
+        targets = {"melt": MELT_TEMP, "cool": COOL_TEMP, "work": WORK_TEMP}
+
+    # وزن كل عينة = المدة حتى العينة التالية
+    dt = np.diff(t, append=t[-1])
+    step = float(np.median(dt[:-1])) if n > 1 else 1.0
+    width = max(1, int(round(smooth_seconds / step))) if step > 0 else 1
+    smoothed = uniform_filter1d(v, size=width, mode="nearest")
+    # الميل عبر نافذة التنعيم كاملة وليس بين عينتين متجاورتين، حتى لا يضخم الضجيج
+    idx = np.arange(n)
+    ahead, behind = np.minimum(idx + width, n - 1), np.maximum(idx - width, 0)
+    span = t[ahead] - t[behind]
+    rate = np.divide(smoothed[ahead] - smoothed[behind], span, out=np.zeros(n), where=span > 0) * 60.0
+
+    trend = np.where(rate > rate_threshold, 1, np.where(rate < -rate_threshold, -1, 0)).astype(np.int8)
+    phases = _phases(t, smoothed, trend, min_phase_seconds)
+
+    low, high = window
+    dwell = {name: float(dt[np.abs(smoothed - target) <= tolerance].sum()) for name, target in targets.items()}
+    mean_temp = float(v.mean())
+    return CurveAnalysis(
+        samples=n,
+        duration=float(t[-1] - t[0]),
+        start_temp=float(v[0]),
+        min_temp=float(v.min()),
+        max_temp=float(v.max()),
+        mean_temp=mean_temp,
+        temper_index=temper_index(mean_temp),
+        smoothed=smoothed,
+        rate=rate,
+        break_points=np.flatnonzero(np.abs(np.diff(v)) > break_threshold) + 1,
+        phases=phases,
+        dwell=dwell,
+        time_below_window=float(dt[smoothed < low].sum()),
+        time_in_window=float(dt[(smoothed >= low) & (smoothed <= high)].sum()),
+        time_above_window=float(dt[smoothed > high].sum()),
+    )
+
+def _phases(t, smoothed, trend, min_phase_seconds):
+    # حدود المقاطع المتتالية ذات نفس الاتجاه
+    edges = np.flatnonzero(np.diff(trend)) + 1
+    starts = np.concatenate(([0], edges))
+    ends = np.concatenate((edges, [len(trend)]))
+    kinds = trend[starts]
+
+    # دمج المقاطع القصيرة في المقطع السابق (عددها صغير، التكرار هنا على المقاطع لا العينات)
+    merged = []
+    for start, end, kind in zip(starts.tolist(), ends.tolist(), kinds.tolist()):
+        short = t[end - 1] - t[start] < min_phase_seconds
+        if merged and (short or merged[-1][2] == kind):
+            merged[-1][1] = end
+        else:
+            merged.append([start, end, kind])
+
+    phases = []
+    cooled = False
+    for start, end, kind in merged:
+        if kind < 0:
+            name, cooled = "cool", True
+        elif kind > 0:
+            name = "rework" if cooled else "melt"
+        else:
+            name = "hold"
+        phases.append(Phase(name, float(t[start]), float(t[end - 1]),
+                            float(smoothed[start]), float(smoothed[end - 1])))
+    return phases
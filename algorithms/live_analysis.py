@@ -0,0 +1,240 @@
+import numpy as np
+from dataclasses import dataclass
+from algorithms.curve_analysis import Phase, MELT_TEMP, COOL_TEMP, WORK_TEMP, WINDOW, temper_index
+
+# a pause longer than this many smoothing windows restarts the level and slope
+GAP_WINDOWS = 10
+
+def ewma(values, alpha, initial):
+    """Exponentially weighted moving average of ``values`` continuing from ``initial``.
+
+    Closed form y[i] = d**(i+1) * initial + alpha * sum(d**(i-k) * x[k]) with
+    d = 1 - alpha, evaluated with cumsum in blocks short enough that d**-k stays
+    far from overflow. Same result as scipy.signal.lfilter without importing it.
+    """
+    decay = 1.0 - alpha
+    if decay < 1e-12:
+        # the window is far shorter than the sample spacing (e.g. across a long gap):
+        # the average is the input itself, and d**-k would overflow
+        return np.array(values, dtype=np.float64)
+    block = max(1, int(50.0 / -np.log(decay))) if 0.0 < decay < 1.0 else len(values)
+    out = np.empty(len(values))
+    for start in range(0, len(values), block):
+        x = values[start:start + block]
+        powers = decay ** np.arange(1, len(x) + 1)
+        out[start:start + len(x)] = powers * (initial + alpha * np.cumsum(x / powers))
+        initial = out[start + len(x) - 1]
+    return out
+
+@dataclass
+class LiveEvent:
+    kind: str       # "phase", "break" or "window"
+    time: float
+    temp: float
+    message: str
+    alert: bool = False
+    phase: str = None     # phase in progress (or just started) when the event was raised
+
+class LiveAnalyzer:
+    """Incremental counterpart of ``analyze_curve`` for the live sample stream.
+
+    ``feed`` takes each new chunk as it is read and keeps constant-size state
+    only: running count/sum/min/max, an EWMA level and an EWMA of its slope
+    (time constant ``smooth_seconds``), the previous raw value for break points,
+    and the open phase. Work per sample is O(1) and runs in NumPy, with a
+    Python loop only over runs of equal trend, which are few per chunk.
+
+    The slope lags the centred window of ``analyze_curve``, so phase changes are
+    reported about ``smooth_seconds`` later. A new phase starts only once its
+    trend has held for ``min_phase_seconds``, and it is dated back to when that
+    trend began; the first phase is dated back to the first sample.
+    """
+
+    def __init__(self, targets=None, window=WINDOW, tolerance=0.5, smooth_seconds=5.0,
+                 rate_threshold=0.2, min_phase_seconds=10.0, break_threshold=2.0):
+        self.targets = targets or {"melt": MELT_TEMP, "cool": COOL_TEMP, "work": WORK_TEMP}
+        self.window = window
+        self.tolerance = tolerance
+        self.smooth_seconds = smooth_seconds
+        self.rate_threshold = rate_threshold
+        self.min_phase_seconds = min_phase_seconds
+        self.break_threshold = break_threshold
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.total = 0.0
+        self.start_temp = None
+        self.first_time = None
+        self.end_time = None
+        self.min_temp = np.inf
+        self.max_temp = -np.inf
+        self.level = None
+        self.slope = 0.0             # °C/min of the EWMA level
+        self.step = None             # seconds per sample, estimated per chunk
+        self.last_time = None
+        self.last_value = None
+        self.trend = None
+        self.candidate = None        # (trend, start time, start level) of a phase not yet confirmed
+        self.cooled = False
+        self.phases = []
+        self.break_points = []       # (time, temp)
+        self.in_window = None
+        self.dwell = {name: 0.0 for name in self.targets}
+        self.time_below_window = 0.0
+        self.time_in_window = 0.0
+        self.time_above_window = 0.0
+
+    @property
+    def mean_temp(self):
+        return self.total / self.samples if self.samples else float("nan")
+
+    @property
+    def temper_index(self):
+        return temper_index(self.mean_temp) if self.samples else 0.0
+
+    @property
+    def phase(self):
+        return self.phases[-1] if self.phases else None
+
+    def feed(self, times, values):
+        """Update with one chunk of samples; returns the LiveEvents it raised."""
+        t = np.asarray(times, dtype=np.float64)
+        v = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(v)
+        if not finite.all():
+            # NaN marks a reconnect gap: no slope or break point across it
+            t, v = t[finite], v[finite]
+            self.last_time = self.last_value = None
+        n = len(v)
+        if n == 0:
+            return []
+        if self.last_time is not None and t[0] - self.last_time > GAP_WINDOWS * self.smooth_seconds:
+            # a pause much longer than the smoothing window: restart the EWMA instead of bridging it
+            self.level, self.slope = None, 0.0
+            self.last_time = self.last_value = None
+
+        self.samples += n
+        self.total += float(v.sum())
+        self.min_temp = min(self.min_temp, float(v.min()))
+        self.max_temp = max(self.max_temp, float(v.max()))
+        if self.start_temp is None:
+            self.start_temp, self.first_time = float(v[0]), float(t[0])
+        self.end_time = float(t[-1])
+
+        # timestamps may be shared by a whole serial chunk, so estimate the spacing per chunk
+        if self.last_time is not None and t[-1] > self.last_time:
+            self.step = float(t[-1] - self.last_time) / n
+        elif n > 1 and t[-1] > t[0]:
+            self.step = float(t[-1] - t[0]) / (n - 1)
+        events = self.find_breaks(t, v)
+        self.last_time, self.last_value = float(t[-1]), float(v[-1])
+        if self.level is None:
+            self.level = float(v[0])
+        if self.step is None:
+            return events
+
+        alpha = 1.0 - np.exp(-self.step / self.smooth_seconds)
+        levels = ewma(v, alpha, self.level)
+        change = np.diff(levels, prepend=self.level) * (60.0 / self.step)
+        slopes = ewma(change, alpha, self.slope)
+        self.level, self.slope = float(levels[-1]), float(slopes[-1])
+
+        trend = np.where(slopes > self.rate_threshold, 1, np.where(slopes < -self.rate_threshold, -1, 0))
+        events += self.update_phases(t, levels, trend)
+        self.update_dwell(levels)
+        events += self.check_window(t, levels)
+        return events
+
+    def find_breaks(self, t, v):
+        previous = self.last_value if self.last_value is not None else v[0]
+        jumps = np.diff(v, prepend=previous)
+        events = []
+        for i in np.flatnonzero(np.abs(jumps) > self.break_threshold).tolist():
+            self.break_points.append((float(t[i]), float(v[i])))
+            events.append(LiveEvent("break", float(t[i]), float(v[i]),
+                                    f"Break: {jumps[i]:+.2f} °C jump to {v[i]:.2f} °C", alert=True,
+                                    phase=self.phase.name if self.phase else None))
+        return events
+
+    def update_phases(self, t, levels, trend):
+        events = []
+        edges = np.flatnonzero(np.diff(trend)) + 1
+        for start, end in zip([0, *edges.tolist()], [*edges.tolist(), len(trend)]):
+            kind = int(trend[start])
+            if kind == self.trend:
+                self.candidate = None
+                continue
+            # a run at index 0 continues the candidate left over from the previous chunk
+            if not (start == 0 and self.candidate and self.candidate[0] == kind):
+                self.candidate = (kind, float(t[start]), float(levels[start]))
+            if t[end - 1] - self.candidate[1] >= self.min_phase_seconds:
+                _, since, temp = self.candidate
+                if self.phase:
+                    self.phase.end_time, self.phase.end_temp = since, temp
+                else:
+                    since, temp = self.first_time, self.start_temp
+                events.append(self.open_phase(kind, since, temp))
+        if self.phase:
+            self.phase.end_time, self.phase.end_temp = float(t[-1]), float(levels[-1])
+        return events
+
+    def open_phase(self, kind, time, temp):
+        if kind < 0:
+            name, self.cooled = "cool", True
+        elif kind > 0:
+            name = "rework" if self.cooled else "melt"
+        else:
+            name = "hold"
+        self.trend, self.candidate = kind, None
+        self.phases.append(Phase(name, time, time, temp, temp))
+        return LiveEvent("phase", time, temp, f"{name.capitalize()} phase from {temp:.2f} °C", phase=name)
+
+    def update_dwell(self, levels):
+        low, high = self.window
+        for name, target in self.targets.items():
+            self.dwell[name] += self.step * int(np.count_nonzero(np.abs(levels - target) <= self.tolerance))
+        below = int(np.count_nonzero(levels < low))
+        above = int(np.count_nonzero(levels > high))
+        self.time_below_window += self.step * below
+        self.time_above_window += self.step * above
+        self.time_in_window += self.step * (len(levels) - below - above)
+
+    def check_window(self, t, levels):
+        """Report entering or leaving the working window once the batch has been cooled."""
+        low, high = self.window
+        inside = (levels >= low) & (levels <= high)
+        previous = self.in_window if self.in_window is not None else bool(inside[0])
+        self.in_window = bool(inside[-1])
+        if not self.cooled or self.phase is None or self.phase.name == "cool":
+            return []
+        changes = np.flatnonzero(np.diff(inside, prepend=previous))
+        events = []
+        for i in changes.tolist():
+            temp = float(levels[i])
+            if inside[i]:
+                events.append(LiveEvent("window", float(t[i]), temp, f"Entered working window at {temp:.2f} °C",
+                                        phase=self.phase.name))
+            else:
+                events.append(LiveEvent("window", float(t[i]), temp,
+                                        f"Left working window at {temp:.2f} °C", alert=True,
+                                        phase=self.phase.name))
+        return events
+
+    def summary(self):
+        """Same keys as ``CurveAnalysis.summary`` where they apply."""
+        return {
+            "samples": self.samples,
+            "duration": round(self.end_time - self.first_time, 2) if self.samples else 0.0,
+            "start_temp": self.start_temp,
+            "min_temp": self.min_temp if self.samples else None,
+            "max_temp": self.max_temp if self.samples else None,
+            "mean_temp": round(self.mean_temp, 2) if self.samples else None,
+            "temper_index": self.temper_index,
+            "break_points": len(self.break_points),
+            "phases": [(p.name, round(p.start_time, 2), round(p.end_time, 2)) for p in self.phases],
+            "dwell": {k: round(v, 2) for k, v in self.dwell.items()},
+            "time_below_window": round(self.time_below_window, 2),
+            "time_in_window": round(self.time_in_window, 2),
+            "time_above_window": round(self.time_above_window, 2),
+        }
@@ -0,0 +1,202 @@
+import os
+import io
+import json
+import datetime
+import threading
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.patches import Patch
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+
+FORMATS = ("png", "svg", "json")
+MAX_BREAK_LINES = 3
+MAX_FLAGGED_CURVES = 20
+
+class ReportRenderer:
+    """Renders graph and analysis reports without pyplot.
+
+    Figures are built once per thread from a template and only their data and
+    text are swapped on each render, so there is no global pyplot state and no
+    second layout pass from ``bbox_inches='tight'``. Safe to call from worker
+    threads and processes. ``fmt`` is "png", "svg" or "json" (summary only).
+    """
+
+    def __init__(self, fmt="png", dpi=100):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format {fmt!r}, expected one of {FORMATS}")
+        self.fmt = fmt
+        self.dpi = dpi
+        self.local = threading.local()
+
+    def output_path(self, path):
+        return os.path.splitext(path)[0] + "." + self.fmt
+
+    def render_graph(self, times, values, path):
+        path = self.output_path(path)
+        if self.fmt == "json":
+            return self.write_json(path, {
+                "samples": int(len(values)),
+                "duration": float(times[-1] - times[0]) if len(times) else 0.0,
+                "min_temp": float(np.min(values)) if len(values) else None,
+                "max_temp": float(np.max(values)) if len(values) else None,
+            })
+        fig, parts = self.template("graph", self.build_graph)
+        parts["line"].set_data(times, values)
+        self.rescale(parts["ax"])
+        return self.save(fig, path)
+
+    def render_analysis(self, times, values, result, path):
+        path = self.output_path(path)
+        if self.fmt == "json":
+            return self.write_json(path, result.summary())
+        fig, parts = self.template("analysis", self.build_analysis)
+        parts["line"].set_data(times, values)
+        idx = result.break_points
+        parts["breaks"].set_offsets(np.column_stack((times[idx], values[idx])) if len(idx) else np.empty((0, 2)))
+        self.rescale(parts["ax"])
+        today = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        parts["start"].set_text(f"Start Temp: {result.start_temp}°C")
+        parts["date"].set_text(f"Date: {today}")
+        for n, label in enumerate(parts["break_lines"]):
+            if n < len(idx):
+                label.set_text(f"Break {n+1}: {values[idx[n]]}°C at {times[idx[n]]}s")
+            else:
+                label.set_text("")
+        parts["index"].set_text(f"Temper Index: {result.temper_index}/10")
+        return self.save(fig, path)
+
+    def render_comparison(self, comparison, path):
+        """Envelope of an algorithms.session_comparison.Comparison over a control chart of its deviation scores."""
+        path = self.output_path(path)
+        if self.fmt == "json":
+            return self.write_json(path, comparison.summary())
+        fig, parts = self.template("comparison", self.build_comparison)
+        ax, chart = parts["ax"], parts["chart"]
+        grid, q = comparison.grid, comparison.quantiles
+        # fill_between has no set_data; the two bands are replaced on every render
+        for band in parts["bands"]:
+            band.remove()
+        parts["bands"] = [ax.fill_between(grid, q[0.05], q[0.95], color="tab:blue", alpha=0.15, lw=0),
+                          ax.fill_between(grid, q[0.25], q[0.75], color="tab:blue", alpha=0.3, lw=0)]
+        parts["median"].set_data(grid, q[0.5])
+        parts["mean"].set_data(grid, comparison.mean)
+        flagged = comparison.out_of_control
+        parts["flagged"].set_segments([np.column_stack((grid, comparison.curves[n])) for n in flagged[:MAX_FLAGGED_CURVES]])
+        if comparison.align == "phase":
+            ax.set_xlabel("Phase")
+            ax.set_xticks(np.arange(len(parts["phase_names"])) + 0.5, parts["phase_names"])
+        else:
+            ax.set_xlabel("Time (s)")
+            ax.xaxis.set_major_locator(AutoLocator())
+            ax.xaxis.set_major_formatter(ScalarFormatter())
+        # relim only sees lines, so the bands and flagged curves are added to the limits by hand
+        ax.relim()
+        extent = np.concatenate([np.column_stack((grid, q[0.05])), np.column_stack((grid, q[0.95]))]
+                                + parts["flagged"].get_segments())
+        ax.update_datalim(extent[np.isfinite(extent).all(axis=1)])
+        ax.autoscale_view()
+        ax.set_title(f"{len(comparison.sessions)} sessions aligned by {comparison.align}, "
+                     f"{len(flagged)} out of control")
+
+        scores = comparison.scores["deviation"]
+        number = np.arange(1, len(scores) + 1)
+        parts["scores"].set_data(number, scores)
+        parts["alarms"].set_offsets(np.column_stack((number[flagged], scores[flagged])) if flagged else np.empty((0, 2)))
+        center, sigma = comparison.limits["deviation"]
+        parts["center"].set_ydata([center, center])
+        parts["upper"].set_ydata([center + 3 * sigma, center + 3 * sigma])
+        self.rescale(chart)
+        return self.save(fig, path)
+
+    def warm_up(self, name="graph"):
+        """Build this thread's ``name`` template and draw it once, so the first real report is fast.
+
+        Call it on the thread that will render (templates are per thread).
+        """
+        if self.fmt == "json":
+            return
+        build = getattr(self, f"build_{name}")
+        fig, _ = self.template(name, build)
+        fig.savefig(io.BytesIO(), format=self.fmt, dpi=self.dpi)
+
+    def template(self, name, build):
+        cache = self.local.__dict__.setdefault("templates", {})
+        if name not in cache:
+            fig = Figure(figsize=(6, 4))
+            FigureCanvasAgg(fig)
+            cache[name] = (fig, build(fig))
+        return cache[name]
+
+    def build_graph(self, fig):
+        ax = fig.add_subplot(1, 1, 1)
+        line, = ax.plot([], [], label="Temperature", color="blue")
+        ax.set_xlabel("Time (s)")
+        ax.set_ylabel("Temperature (°C)")
+        ax.set_title("Temperature Graph")
+        ax.legend()
+        ax.grid()
+        fig.subplots_adjust(left=0.12, right=0.96, top=0.9, bottom=0.13)
+        return {"ax": ax, "line": line}
+
+    def build_analysis(self, fig):
+        ax = fig.add_subplot(2, 1, 1)
+        line, = ax.plot([], [], label="Temperature", color="blue")
+        breaks = ax.scatter([], [], color="red", label="Break Points")
+        ax.set_xlabel("Time (s)")
+        ax.set_ylabel("Temperature (°C)")
+        ax.legend()
+        ax.grid()
+        text_ax = fig.add_subplot(2, 1, 2)
+        text_ax.axis("off")
+        parts = {
+            "ax": ax,
+            "line": line,
+            "breaks": breaks,
+            "start": text_ax.text(0.1, 0.8, "", fontsize=10),
+            "date": text_ax.text(0.1, 0.6, "", fontsize=10),
+            "break_lines": [text_ax.text(0.1, 0.4 - n * 0.1, "", fontsize=8) for n in range(MAX_BREAK_LINES)],
+            "index": text_ax.text(0.1, 0.05, "", fontsize=12, fontweight="bold"),
+        }
+        fig.subplots_adjust(left=0.12, right=0.96, top=0.97, bottom=0.03, hspace=0.35)
+        return parts
+
+    def build_comparison(self, fig):
+        from algorithms.session_comparison import PHASE_SEGMENTS
+        fig.set_size_inches(9, 7)
+        ax = fig.add_subplot(2, 1, 1)
+        median, = ax.plot([], [], color="navy", lw=1.5, zorder=3)
+        mean, = ax.plot([], [], color="black", lw=1, ls="--", zorder=3)
+        flagged = LineCollection([], colors="red", linewidths=0.6, alpha=0.5, zorder=0.5)
+        ax.add_collection(flagged)
+        ax.set_ylabel("Temperature (°C)")
+        ax.legend([Patch(color="tab:blue", alpha=0.15), Patch(color="tab:blue", alpha=0.3), median, mean, flagged],
+                  ["5-95 %", "25-75 %", "Median", "Mean", "Out of control"], fontsize=8, loc="upper right")
+        ax.grid()
+        chart = fig.add_subplot(2, 1, 2)
+        scores, = chart.plot([], [], marker="o", ms=3, lw=0.8, color="blue")
+        alarms = chart.scatter([], [], color="red", zorder=3)
+        center = chart.axhline(0.0, color="green", lw=1)
+        upper = chart.axhline(0.0, color="red", lw=1, ls="--")
+        chart.set_xlabel("Session (oldest first)")
+        chart.set_ylabel("RMS deviation (°C)")
+        chart.legend([scores, center, upper], ["Deviation from median", "Center", "UCL (3 sigma)"], fontsize=8, loc="upper left")
+        chart.grid()
+        fig.subplots_adjust(left=0.09, right=0.97, top=0.95, bottom=0.08, hspace=0.3)
+        return {"ax": ax, "chart": chart, "bands": [], "median": median, "mean": mean, "flagged": flagged,
+                "scores": scores, "alarms": alarms, "center": center, "upper": upper,
+                "phase_names": PHASE_SEGMENTS}
+
+    def rescale(self, ax):
+        ax.relim()
+        ax.autoscale_view()
+
+    def save(self, fig, path):
+        fig.savefig(path, format=self.fmt, dpi=self.dpi)
+        return path
+
+    def write_json(self, path, summary):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return path
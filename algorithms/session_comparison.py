@@ -0,0 +1,298 @@
+import os
+import csv
+import argparse
+import numpy as np
+from dataclasses import dataclass, field
+from numpy.lib.stride_tricks import sliding_window_view
+
+from storage.session_file import load_session, find_sessions
+from storage.catalog import SessionCatalog, CATALOG_PATH, guess_started
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# حدود المراحل المستعملة في المحاذاة: البداية، أول تبريد، أول إعادة تسخين، النهاية
+PHASE_SEGMENTS = ("melt", "cool", "work")
+# Western Electric rules: (name, points in window, points needed, threshold in sigma)
+SPC_RULES = (
+    ("beyond 3 sigma", 1, 1, 3.0),
+    ("2 of 3 beyond 2 sigma", 3, 2, 2.0),
+    ("4 of 5 beyond 1 sigma", 5, 4, 1.0),
+    ("8 on one side", 8, 8, 0.0),
+)
+D2 = 1.128  # mean moving range of two normal samples, in sigma
+SCORES_FILE = "comparison_scores.csv"
+SCORE_COLUMNS = ["session", "started", "coverage", "deviation", "bias", "max_deviation", "violations"]
+
+@dataclass
+class Comparison:
+    sessions: list                                 # paths, oldest first
+    started: list                                  # ISO start time of each session
+    align: str                                     # "time" or "phase"
+    grid: np.ndarray = field(repr=False)           # seconds, or phase coordinate 0..len(PHASE_SEGMENTS)
+    curves: np.ndarray = field(repr=False)         # sessions x grid, NaN where a session has no data
+    mean: np.ndarray = field(repr=False)
+    quantiles: dict = field(repr=False)            # quantile -> curve
+    scores: dict = field(repr=False)               # metric -> one value per session
+    limits: dict = field(default_factory=dict)     # metric -> (center, sigma)
+    violations: dict = field(default_factory=dict) # session index -> ["deviation: beyond 3 sigma", ...]
+    excluded: list = field(default_factory=list)   # (path, reason)
+
+    @property
+    def out_of_control(self):
+        return sorted(self.violations)
+
+    def rows(self):
+        for n, path in enumerate(self.sessions):
+            yield {
+                "session": path,
+                "started": self.started[n],
+                "coverage": round(float(self.scores["coverage"][n]), 3),
+                "deviation": round(float(self.scores["deviation"][n]), 3),
+                "bias": round(float(self.scores["bias"][n]), 3),
+                "max_deviation": round(float(self.scores["max_deviation"][n]), 3),
+                "violations": "; ".join(self.violations.get(n, [])),
+            }
+
+    def summary(self):
+        return {
+            "align": self.align,
+            "sessions": len(self.sessions),
+            "grid_points": int(len(self.grid)),
+            "limits": {metric: [round(center, 3), round(sigma, 3)] for metric, (center, sigma) in self.limits.items()},
+            "out_of_control": [self.sessions[n] for n in self.out_of_control],
+            "excluded": [list(item) for item in self.excluded],
+            "scores": list(self.rows()),
+        }
+
+def resample(times, values, grid):
+    """``values`` at ``grid`` by linear interpolation, NaN outside the session.
+
+    Only the samples either side of each grid point are read (a binary search
+    and a gather), so a memory-mapped .chs is paged in at a few thousand places
+    instead of in full.
+    """
+    n = len(times)
+    if n < 2:
+        return np.full(len(grid), np.nan)
+    i = np.clip(np.searchsorted(times, grid), 1, n - 1)
+    t0, t1 = np.asarray(times[i - 1]), np.asarray(times[i])
+    v0, v1 = np.asarray(values[i - 1]), np.asarray(values[i])
+    span = t1 - t0
+    w = np.divide(grid - t0, span, out=np.zeros(len(grid)), where=span > 0)
+    out = v0 + np.clip(w, 0.0, 1.0) * (v1 - v0)
+    out[(grid < times[0]) | (grid > times[n - 1])] = np.nan
+    return out
+
+def nan_quantiles(curves, quantiles=QUANTILES):
+    """Per-column quantiles of ``curves`` ignoring NaN, with one sort instead of a loop over columns."""
+    ordered = np.sort(curves, axis=0)          # NaN sorts last
+    counts = np.isfinite(curves).sum(axis=0)
+    result = {}
+    for q in quantiles:
+        position = q * np.maximum(counts - 1, 0)
+        low = np.floor(position).astype(np.intp)
+        high = np.minimum(low + 1, np.maximum(counts - 1, 0))
+        a = np.take_along_axis(ordered, low[None], axis=0)[0]
+        b = np.take_along_axis(ordered, high[None], axis=0)[0]
+        curve = a + (position - low) * (b - a)
+        curve[counts == 0] = np.nan
+        result[q] = curve
+    return result
+
+def phase_landmarks(grid, curve):
+    """(start, first cool, first rework after it, end) in seconds, or None when a phase is missing."""
+    from algorithms.curve_analysis import analyze_curve
+    finite = np.isfinite(curve)
+    t, v = grid[finite], curve[finite]
+    if len(t) < 3:
+        return None
+    # نافذة أطول من تحليل الجلسة الواحدة: الضجيج أثناء الثبات يصنع مراحل تبريد وهمية
+    phases = analyze_curve(t, v, smooth_seconds=30.0, min_phase_seconds=60.0).phases
+    cool = next((p.start_time for p in phases if p.name == "cool"), None)
+    work = next((p.start_time for p in phases if p.name == "rework"), None)
+    if cool is None or work is None:
+        return None
+    return t[0], cool, work, t[-1]
+
+def control_limits(values, baseline=None):
+    """(center, sigma) of an individuals chart from the first ``baseline`` values (Phase I limits).
+
+    Sigma is the mean moving range over D2. Points beyond 3 sigma are dropped
+    and the limits recomputed until none is left, so an out-of-control run does
+    not drag the center line and flag the good runs on the other side.
+    """
+    reference = values[:baseline] if baseline else values
+    reference = reference[np.isfinite(reference)]
+    if len(reference) < 2:
+        return float(np.mean(reference)) if len(reference) else 0.0, 0.0
+    while True:
+        center = float(reference.mean())
+        sigma = float(np.abs(np.diff(reference)).mean() / D2)
+        inside = np.abs(reference - center) <= 3.0 * sigma
+        if inside.all() or inside.sum() < 2:
+            return center, sigma
+        reference = reference[inside]
+
+def western_electric(values, center, sigma, upper_only=False):
+    """{rule name: bool mask} of the points that complete each rule's pattern."""
+    z = (values - center) / sigma if sigma > 0 else np.zeros(len(values))
+    masks = {}
+    for name, window, needed, threshold in SPC_RULES:
+        mask = np.zeros(len(values), dtype=bool)
+        for side in ((1,) if upper_only else (1, -1)):
+            beyond = side * z > threshold
+            if len(values) >= window:
+                hits = sliding_window_view(beyond, window).sum(axis=1) >= needed
+                # the point that completes the pattern must itself be part of it
+                mask[window - 1:] |= hits & beyond[window - 1:]
+        masks[name] = mask
+    return masks
+
+def session_started(path, session):
+    return session.metadata.get("started") or guess_started(path)
+
+def compare_sessions(paths, align="time", step=1.0, duration=None, points_per_phase=500, baseline=None):
+    """Align ``paths`` on one grid and score every session against the group.
+
+    ``align="time"`` compares elapsed seconds since each session started, every
+    ``step`` seconds up to ``duration`` (default: the longest session).
+    ``align="phase"`` also finds each session's first cool and rework and warps
+    the melt, cool and work segments onto ``points_per_phase`` points each, so
+    runs that hold longer in one phase still line up; sessions without those
+    phases are excluded.
+
+    Each session is scored against the median curve: RMS deviation, mean bias
+    and largest deviation. Deviation and bias are then charted in start order
+    (individuals chart, limits from the first ``baseline`` sessions or all of
+    them), and the Western Electric rules mark the runs that are out of control.
+    """
+    loaded, excluded = [], []
+    for path in paths:
+        try:
+            session = load_session(path)
+        except (ValueError, OSError) as e:
+            excluded.append((path, str(e)))
+            continue
+        if len(session) < 2:
+            excluded.append((path, "empty"))
+            continue
+        loaded.append((session_started(path, session), path, session))
+    loaded.sort(key=lambda item: item[0])
+    if not loaded:
+        raise ValueError("No sessions to compare")
+
+    if duration is None:
+        duration = max(float(s.times[-1] - s.times[0]) for _, _, s in loaded)
+    grid = np.arange(0.0, duration + step / 2, step)
+    curves = np.empty((len(loaded), len(grid)))
+    for n, (_, _, session) in enumerate(loaded):
+        curves[n] = resample(session.times, session.values, grid + float(session.times[0]))
+
+    if align == "phase":
+        segments = len(PHASE_SEGMENTS)
+        phase_grid = np.linspace(0.0, segments, segments * points_per_phase + 1)
+        kept, warped = [], []
+        for n, (_, path, _) in enumerate(loaded):
+            landmarks = phase_landmarks(grid, curves[n])
+            if landmarks is None:
+                excluded.append((path, "no cool and rework phase"))
+                continue
+            seconds = np.interp(phase_grid, np.arange(segments + 1), landmarks)
+            warped.append(np.interp(seconds, grid, curves[n]))
+            kept.append(n)
+        if not kept:
+            raise ValueError("No session has a cool and a rework phase to align on")
+        loaded = [loaded[n] for n in kept]
+        grid, curves = phase_grid, np.vstack(warped)
+    elif align != "time":
+        raise ValueError(f"Unknown alignment {align!r}, expected 'time' or 'phase'")
+
+    quantiles = nan_quantiles(curves)
+    finite = np.isfinite(curves)
+    counts = finite.sum(axis=0)
+    mean = np.divide(np.where(finite, curves, 0.0).sum(axis=0), counts,
+                     out=np.full(len(grid), np.nan), where=counts > 0)
+    deviation = curves - quantiles[0.5]
+    valid = finite.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = {
+            "coverage": valid / len(grid),
+            "deviation": np.sqrt(np.nansum(deviation ** 2, axis=1) / valid),
+            "bias": np.nansum(deviation, axis=1) / valid,
+            "max_deviation": np.nanmax(np.abs(deviation), axis=1),
+        }
+
+    limits, violations = {}, {}
+    # الانحراف لا يكون سالبًا: الخروج من الأسفل يعني جولة أقرب من المعتاد إلى الوسيط، وهذا ليس عيبًا
+    for metric, upper_only in (("deviation", True), ("bias", False)):
+        center, sigma = limits[metric] = control_limits(scores[metric], baseline)
+        for rule, mask in western_electric(scores[metric], center, sigma, upper_only).items():
+            for n in np.flatnonzero(mask):
+                violations.setdefault(int(n), []).append(f"{metric}: {rule}")
+
+    return Comparison(
+        sessions=[path for _, path, _ in loaded],
+        started=[started for started, _, _ in loaded],
+        align=align,
+        grid=grid,
+        curves=curves,
+        mean=mean,
+        quantiles=quantiles,
+        scores=scores,
+        limits=limits,
+        violations=violations,
+        excluded=excluded,
+    )
+
+def write_scores(comparison, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SCORE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(comparison.rows())
+    return path
+
+def select_sessions(args):
+    if args.sessions:
+        paths = []
+        for item in args.sessions:
+            paths.extend(find_sessions(item) if os.path.isdir(item) else [item])
+        return paths
+    catalog = SessionCatalog(args.catalog or os.path.join(args.data, os.path.basename(CATALOG_PATH)))
+    rows = catalog.sessions(args.since, args.until, channel=args.channel)
+    return [row["binary_path"] or row["csv_path"] for row in rows if row["binary_path"] or row["csv_path"]]
+
+if __name__ == "__main__":
+    import time
+    from algorithms.report_renderer import ReportRenderer
+    parser = argparse.ArgumentParser(description="Compare many sessions and flag out-of-control runs")
+    parser.add_argument("sessions", nargs="*", help="session files or folders (default: the catalog)")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--catalog", default=None)
+    parser.add_argument("--since")
+    parser.add_argument("--until")
+    parser.add_argument("--channel")
+    parser.add_argument("--align", default="time", choices=["time", "phase"])
+    parser.add_argument("--step", type=float, default=1.0, help="grid step in seconds")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to compare (default: longest session)")
+    parser.add_argument("--baseline", type=int, default=None, help="sessions that set the control limits (default: all)")
+    parser.add_argument("--results", default="results")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "json"])
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    paths = select_sessions(args)
+    try:
+        comparison = compare_sessions(paths, args.align, args.step, args.duration, baseline=args.baseline)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        raise SystemExit(1)
+    for path, reason in comparison.excluded:
+        print(f"[ERROR] {path}: {reason}")
+    for n in comparison.out_of_control:
+        print(f"[WARNING] {comparison.sessions[n]}: {'; '.join(comparison.violations[n])}")
+    os.makedirs(args.results, exist_ok=True)
+    report = ReportRenderer(args.format, args.dpi).render_comparison(
+        comparison, os.path.join(args.results, f"comparison_{args.align}.{args.format}"))
+    scores = write_scores(comparison, os.path.join(args.results, SCORES_FILE))
+    print(f"[SUCCESS] Compared {len(comparison.sessions)} session(s) in {time.perf_counter() - began:.2f} s, "
+          f"{len(comparison.out_of_control)} out of control. Report: {report}, scores: {scores}")
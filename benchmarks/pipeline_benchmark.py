@@ -0,0 +1,105 @@
+"""End-to-end throughput and latency of source -> buffer -> recorder -> plot.
+
+Runs headless (Qt offscreen), so it works in CI:
+
+    python -m benchmarks.pipeline_benchmark --rates 100,1000,10000,100000 --seconds 3
+    python -m benchmarks.pipeline_benchmark --source serial   # through ArduinoReader's parser
+    python -m benchmarks.pipeline_benchmark --source binary   # same, with 5-byte binary frames
+
+For each rate it reports the rate actually delivered into the buffer, how many
+samples the recorder wrote or lost, and the latency from a sample's receipt
+timestamp until it was on the plot (measured on the newest sample of every
+frame). A rate counts as sustained when nothing was lost and p99 latency stays
+within two plot frames.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from sensors.arduino_reader import ArduinoReader
+from sensors.simulated import SyntheticSource, SimulatedSerial
+from storage.session_recorder import SessionRecorder
+from ui.graph_widget import GraphWidget
+
+def make_source(kind, rate):
+    if kind in ("serial", "binary"):
+        protocol = "binary" if kind == "binary" else "text"
+        return ArduinoReader(port="SIM", protocol=protocol,
+                             serial_factory=SimulatedSerial.factory(rate_hz=rate, protocol=protocol))
+    return SyntheticSource(rate_hz=rate, time_scale=10.0)
+
+def run_rate(app, kind, rate, seconds, refresh_ms):
+    source = make_source(kind, rate)
+    graph = GraphWidget(source, refresh_ms=refresh_ms)
+    graph.resize(1000, 600)
+    latencies = []
+    frame_times = []
+    with tempfile.TemporaryDirectory() as data_dir, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        recorder = SessionRecorder(source.buffer, data_dir=data_dir)
+        source.start_reading()
+        time.sleep(0.2)
+        first = source.buffer.written
+        recorder.start()
+        graph.start_graph()
+        graph.timer.stop()  # frames are driven below so they can be timed
+        start = time.monotonic()
+        next_frame = start
+        while time.monotonic() - start < seconds:
+            next_frame += refresh_ms / 1000.0
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+            began = time.perf_counter()
+            graph.update_plot()
+            app.processEvents()
+            frame_times.append(time.perf_counter() - began)
+            if len(graph.series):
+                newest = graph.series.x[len(graph.series) - 1] + graph.start_time
+                latencies.append(time.monotonic() - newest)
+        elapsed = time.monotonic() - start
+        delivered = source.buffer.written - first
+        source.stop_reading()
+        recorder.stop(wait=True)
+        graph.running = False
+    latencies = np.array(latencies) * 1000.0
+    frames = np.array(frame_times) * 1000.0
+    p99 = float(np.percentile(latencies, 99)) if len(latencies) else float("inf")
+    return {
+        "target": rate,
+        "delivered": delivered / elapsed,
+        "recorded": recorder.samples_written,
+        "dropped": recorder.dropped,
+        "latency_p50": float(np.percentile(latencies, 50)) if len(latencies) else float("inf"),
+        "latency_p99": p99,
+        "frame_p99": float(np.percentile(frames, 99)) if len(frames) else 0.0,
+        "sustained": recorder.dropped == 0 and delivered / elapsed >= 0.95 * rate and p99 <= 2 * refresh_ms + 50,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", choices=["synthetic", "serial", "binary"], default="synthetic")
+    parser.add_argument("--rates", default="100,1000,10000,100000")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--refresh-ms", type=int, default=16, help="plot frame interval (16 = 60 fps)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'rate/s':>10} {'delivered/s':>12} {'recorded':>10} {'dropped':>8} "
+          f"{'lat p50 ms':>11} {'lat p99 ms':>11} {'frame p99 ms':>13}  sustained")
+    best = 0
+    for rate in (float(r) for r in args.rates.split(",")):
+        r = run_rate(app, args.source, rate, args.seconds, args.refresh_ms)
+        print(f"{r['target']:>10.0f} {r['delivered']:>12.0f} {r['recorded']:>10} {r['dropped']:>8} "
+              f"{r['latency_p50']:>11.1f} {r['latency_p99']:>11.1f} {r['frame_p99']:>13.2f}  {'yes' if r['sustained'] else 'no'}")
+        if r["sustained"]:
+            best = max(best, r["target"])
+    print(f"Max sustained rate ({args.source}): {best:.0f} samples/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cold-start time to a usable window, and the latency of the first report.
+
+Each run is a fresh interpreter (Qt offscreen, synthetic source), so module
+imports are paid again every time:
+
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --no-prewarm   # first report pays the imports
+
+For every run it reports the time from process spawn to the window being shown,
+which heavy modules were loaded at that point (the goal is none), how long the
+background pre-warm took, and how long the first graph report took after it.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+HEAVY_MODULES = ("pandas", "matplotlib", "scipy")
+
+def child(prewarm):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    import main
+    from sensors.simulated import SyntheticSource
+    imported = time.monotonic()
+
+    app = QApplication(sys.argv)
+    source = SyntheticSource(rate_hz=100.0, time_scale=50.0)
+    source.start_reading()
+    window = main.ChocoMonitorUI(source, {})
+    window.show()
+    app.processEvents()
+    shown = time.monotonic()
+    heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    warm = 0.0
+    if prewarm:
+        began = time.monotonic()
+        for future in (window.graph_widget.prewarm(), window.analysis_executor.submit(window.warm_analysis)):
+            future.result()
+        warm = time.monotonic() - began
+
+    graph = window.graph_widget
+    graph.start_graph()
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    graph.update_plot()
+    graph.running = False
+    began = time.monotonic()
+    x, y = graph.series.view(max_points=4000)
+    graph.write_report(x.copy(), y.copy(), os.path.join(tempfile.mkdtemp(), "graph.png"))
+    report = time.monotonic() - began
+    source.stop_reading()
+    print(json.dumps({"imported": imported, "shown": shown, "heavy": heavy, "warm": warm, "report": report}))
+
+def run(prewarm):
+    args = [sys.executable, "-m", "benchmarks.startup_benchmark", "--child"]
+    if not prewarm:
+        args.append("--no-prewarm")
+    with tempfile.TemporaryDirectory() as cwd:
+        # the child runs in a scratch directory so catalog/results files stay out of the tree
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+        spawned = time.monotonic()
+        out = subprocess.run(args, cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["import_ms"] = (result["imported"] - spawned) * 1000.0
+    result["window_ms"] = (result["shown"] - spawned) * 1000.0
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-prewarm", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(not args.no_prewarm)
+        return
+
+    print(f"{'run':>4} {'imports ms':>11} {'window ms':>10} {'prewarm ms':>11} {'1st report ms':>14}  heavy modules at window")
+    windows, reports = [], []
+    for n in range(args.runs):
+        r = run(not args.no_prewarm)
+        windows.append(r["window_ms"])
+        reports.append(r["report"] * 1000.0)
+        print(f"{n + 1:>4} {r['import_ms']:>11.0f} {r['window_ms']:>10.0f} {r['warm'] * 1000.0:>11.0f} "
+              f"{r['report'] * 1000.0:>14.1f}  {', '.join(r['heavy']) or 'none'}")
+    windows.sort()
+    reports.sort()
+    print(f"Median: window {windows[len(windows) // 2]:.0f} ms, first report {reports[len(reports) // 2]:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import time
+import logging
+import numpy as np
+from dataclasses import dataclass
+from threading import Thread, Event, Lock
+
+log = logging.getLogger(__name__)
+
+IDLE = "idle"
+ARMED = "armed"          # waiting for the first step's temperature to start the run
+WAITING = "waiting"      # run in progress, waiting for the current step's temperature
+HOLDING = "holding"      # current step reached, counting down its hold time
+
+@dataclass
+class ProgramStep:
+    temperature: float   # °C the stream has to reach (from either side)
+    hold: float          # seconds to stay in this step once reached
+
+def program_from_config(config):
+    """Steps from config.json.
+
+    ``"program": [{"temperature": 45, "duration": 5}, ...]`` gives a multi-step
+    program; otherwise ``start_temperature``/``duration`` give a single step.
+    Durations are minutes, as in the settings dialog.
+    """
+    if config.get("program"):
+        return [ProgramStep(float(step["temperature"]), float(step["duration"]) * 60.0)
+                for step in config["program"]]
+    if "start_temperature" in config and "duration" in config:
+        return [ProgramStep(float(config["start_temperature"]), float(config["duration"]) * 60.0)]
+    return []
+
+class ProgramRunner:
+    """Runs a temperature program against a SampleBuffer.
+
+    Once armed, a background thread watches the stream with its own cursor. When
+    the stream reaches the first step's temperature, the run starts. Each step's
+    hold ends at an absolute deadline taken from the monotonic timestamp of the
+    sample that reached its temperature. The thread sleeps until exactly that
+    deadline instead of counting ticks, so nothing drifts however long the
+    program is. After the last hold the run finishes.
+
+    Listeners are called as ``callback(event, step)`` from the runner thread, or
+    from the caller's thread for ``start_now``/``abort``. Events are "armed",
+    "started", "waiting", "holding", "finished" and "aborted". A Qt consumer
+    should re-emit them through a signal, so its handlers run on the GUI thread.
+    """
+
+    def __init__(self, buffer, program=(), poll_interval=0.02, arm_margin=1.0):
+        self.buffer = buffer
+        # °C an armed stream must first be away from the start temperature, so noise
+        # around it right after a run (re-armed) does not start the next one at once
+        self.arm_margin = arm_margin
+        self.program = list(program)
+        self.pending_program = None
+        self.poll_interval = poll_interval
+        self.state = IDLE
+        self.step = 0
+        self.deadline = None
+        self.side = None
+        self.listeners = []
+        self.lock = Lock()
+        self.wake = Event()
+        self.thread = None
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def notify(self, events):
+        for event, step in events:
+            log.info("⏱ Program %s (step %d/%d)", event, step + 1, len(self.program))
+            for callback in self.listeners:
+                callback(event, step)
+
+    def set_program(self, program):
+        """Replace the program; a run in progress keeps the old one until it ends."""
+        with self.lock:
+            if self.is_running():
+                self.pending_program = list(program)
+                return
+            self.program, self.side = list(program), None
+            if not self.program:
+                self.state = IDLE
+
+    def is_running(self):
+        return self.state in (WAITING, HOLDING)
+
+    def remaining(self):
+        """Seconds left in the current hold, or None when not holding."""
+        deadline = self.deadline
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def arm(self):
+        """Start the run automatically when the stream reaches the first step's temperature."""
+        with self.lock:
+            if not self.program or self.state != IDLE:
+                return False
+            self.state, self.step, self.side = ARMED, 0, None
+            self.cursor = self.buffer.cursor()
+            self.ensure_thread()
+        self.notify([("armed", 0)])
+        return True
+
+    def start_now(self):
+        """Manual start: the first step counts as reached now."""
+        with self.lock:
+            if not self.program or self.is_running():
+                return False
+            self.state, self.step = WAITING, 0
+            events = [("started", 0)] + self.reach(time.monotonic())
+            self.ensure_thread()
+        self.wake.set()
+        self.notify(events)
+        return True
+
+    def abort(self):
+        with self.lock:
+            if self.state == IDLE:
+                return False
+            was_running = self.is_running()
+            self.finish()
+        self.wake.set()
+        if was_running:
+            self.notify([("aborted", self.step)])
+        return True
+
+    def ensure_thread(self):
+        # called with the lock held; run() clears self.thread under the same lock when it exits
+        if self.thread is None:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            with self.lock:
+                if self.state == IDLE:
+                    self.thread = None
+                    return
+                deadline = self.deadline
+            timeout = self.poll_interval if deadline is None else deadline - time.monotonic()
+            if timeout > 0 and self.wake.wait(timeout):
+                self.wake.clear()
+                continue
+            with self.lock:
+                events = self.tick()
+            self.notify(events)
+
+    def tick(self):
+        if self.state == HOLDING:
+            if time.monotonic() < self.deadline:
+                return []
+            if self.step + 1 >= len(self.program):
+                self.finish()
+                return [("finished", self.step)]
+            self.state, self.step, self.side, self.deadline = WAITING, self.step + 1, None, None
+            return [("waiting", self.step)]
+        if self.state not in (ARMED, WAITING):
+            return []
+        timestamps, values, self.cursor = self.buffer.read_since(self.cursor)
+        hit = self.crossing(values)
+        if hit is None:
+            return []
+        events = [("started", 0)] if self.state == ARMED else []
+        return events + self.reach(float(timestamps[hit]))
+
+    def crossing(self, values):
+        """Index of the first sample at or past the current step's temperature."""
+        finite = np.flatnonzero(np.isfinite(values))
+        if not len(finite):
+            return None
+        difference = values[finite] - self.program[self.step].temperature
+        first = 0
+        if self.side is None:
+            # the side of the target the stream is on when the step begins
+            if self.state == ARMED and self.arm_margin > 0:
+                away = np.flatnonzero(np.abs(difference) > self.arm_margin)
+                if not len(away):
+                    return None
+                first = int(away[0])
+            self.side = np.sign(difference[first])
+        offset = np.sign(difference[first:])
+        hits = np.flatnonzero((offset == 0) | (offset == -self.side))
+        return int(finite[first + hits[0]]) if len(hits) else None
+
+    def reach(self, timestamp):
+        """The current step's temperature was reached at ``timestamp``: start its hold."""
+        self.state = HOLDING
+        self.deadline = timestamp + self.program[self.step].hold
+        self.cursor = self.buffer.cursor()
+        return [("holding", self.step)]
+
+    def finish(self):
+        self.state, self.deadline, self.side = IDLE, None, None
+        if self.pending_program is not None:
+            self.program, self.pending_program = self.pending_program, None
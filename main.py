@@ -1,12 +1,34 @@
 import sys
 from PyQt6.QtWidgets import QApplication
-from sensors.arduino_reader import ArduinoReader
+from PyQt6.QtCore import QTimer
+from sensors.factory import load_config, create_sources
 from ui.interface import ChocoMonitorUI
+from monitoring.log import setup_logging
+from monitoring.metrics import start_http_server
+
+def create_source(config):
+    # "channel" picks which of several "ports" channels the window shows
+    sources = create_sources(config)
+    source = sources.get(config.get("channel")) or next(iter(sources.values()))
+    source.start_reading()
+    return source
 
 if __name__ == "__main__":
+    setup_logging()
+    config = load_config()
+    # "metrics_port": 9108 serves Prometheus text at http://127.0.0.1:9108/metrics
+    if config.get("metrics_port"):
+        start_http_server(config["metrics_port"])
     app = QApplication(sys.argv)
-    arduino_reader = ArduinoReader()
-    arduino_reader.start_reading()
-    window = ChocoMonitorUI(arduino_reader)
+    # "daemon": true leaves the ports to python -m sensors.daemon (started here if needed)
+    if config.get("daemon"):
+        from sensors.remote import RemoteRecorder, connect
+        arduino_reader = connect(config)
+        window = ChocoMonitorUI(arduino_reader, config, recorder=RemoteRecorder(arduino_reader))
+    else:
+        arduino_reader = create_source(config)
+        window = ChocoMonitorUI(arduino_reader, config)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    # matplotlib/scipy load in the background after the first paint
+    QTimer.singleShot(0, window.prewarm)
+    sys.exit(app.exec())
@@ -0,0 +1,39 @@
+import time
+import logging
+
+class RateLimitFilter(logging.Filter):
+    """Lets each message template through at most ``burst`` times per ``interval`` seconds.
+
+    Keyed by (logger, template) so one noisy call site cannot hide another.
+    Suppressed records are counted and reported on the next one that passes.
+    """
+
+    def __init__(self, interval=10.0, burst=5):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.windows = {}
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        start, passed, suppressed = self.windows.get(key, (now, 0, 0))
+        if now - start >= self.interval:
+            start, passed = now, 0
+        if passed >= self.burst:
+            self.windows[key] = (start, passed, suppressed + 1)
+            return False
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        self.windows[key] = (start, passed + 1, 0)
+        return True
+
+def setup_logging(level=logging.INFO, interval=10.0, burst=5):
+    """Console logging for the app with per-call-site rate limiting."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S"))
+    handler.addFilter(RateLimitFilter(interval, burst))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    return handler
@@ -0,0 +1,160 @@
+import time
+import bisect
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Hot-path cost is one attribute add (counters) or one bisect (histograms), with
+# no locks: each metric has a single writer thread, and a reader that races a
+# write sees a value at most one update old.
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        yield self.name, self.value
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.fn() if self.fn else self.value
+
+    def samples(self):
+        yield self.name, self.get()
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + [float("inf")], self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{le="{bound:g}"}}', cumulative
+        yield f'{self.name}_bucket{{le="+Inf"}}', self.count
+        yield f"{self.name}_sum", self.sum
+        yield f"{self.name}_count", self.count
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        # the same name returns the existing metric, so modules can declare freely
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text=""):
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name, help_text="", fn=None):
+        gauge = self.register(Gauge(name, help_text, fn))
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name, help_text="", buckets=()):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render_prometheus(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+class RateTracker:
+    """Per-second rates of counters between successive ``rates()`` calls."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.last = {}
+        self.last_time = time.monotonic()
+
+    def rates(self):
+        now = time.monotonic()
+        elapsed = max(now - self.last_time, 1e-9)
+        result = {}
+        for metric in self.registry.metrics.values():
+            if metric.kind == "counter":
+                result[metric.name] = (metric.value - self.last.get(metric.name, metric.value)) / elapsed
+                self.last[metric.name] = metric.value
+        self.last_time = now
+        return result
+
+REGISTRY = Registry()
+
+# زمن العمليات بالمللي ثانية
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+SERIAL_BYTES = REGISTRY.counter("serial_bytes_total", "Bytes read from serial ports")
+SERIAL_LINES = REGISTRY.counter("serial_lines_total", "Complete lines read from serial ports")
+PARSE_ERRORS = REGISTRY.counter("serial_parse_errors_total", "Lines that were not a valid number")
+PLOT_LATENCY = REGISTRY.histogram("serial_to_plot_latency_ms", "Receipt of newest sample until it is plotted", LATENCY_BUCKETS_MS)
+PLOT_DURATION = REGISTRY.histogram("update_plot_duration_ms", "GraphWidget.update_plot wall time", LATENCY_BUCKETS_MS)
+RECORDER_FLUSH = REGISTRY.histogram("recorder_flush_duration_ms", "SessionRecorder batch write + fsync time", LATENCY_BUCKETS_MS)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_http_server(port=9108, host="127.0.0.1"):
+    """Serve Prometheus text format on http://host:port/metrics from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
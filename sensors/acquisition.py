@@ -0,0 +1,182 @@
+import os
+import time
+import atexit
+import logging
+import selectors
+import serial
+from threading import Thread, Event
+from sensors.sample_buffer import SampleBuffer
+from sensors.source import SensorSource
+from sensors.line_parser import make_parser
+from monitoring.metrics import SERIAL_BYTES
+
+log = logging.getLogger(__name__)
+
+class Channel(SensorSource):
+    """One measured value on one port, with the same consumer surface as ArduinoReader."""
+
+    def __init__(self, name, buffer_capacity, service):
+        self.name = name
+        self.buffer = SampleBuffer(buffer_capacity)
+        self.service = service
+        self.port_reader = None
+
+    @property
+    def state(self):
+        connected = self.port_reader is not None and self.port_reader.ser is not None
+        return "connected" if connected else "connecting" if self.service.running else "disconnected"
+
+    def start_reading(self):
+        self.service.start_reading()
+
+    def stop_reading(self):
+        self.service.stop_reading()
+
+class PortReader:
+    """Splits one port's byte stream into ``ch1,ch2,...`` lines and fills its channels."""
+
+    def __init__(self, port, baudrate, channels, serial_factory, protocol="text"):
+        self.port = port
+        self.baudrate = baudrate
+        self.channels = channels
+        self.buffers = tuple(channel.buffer for channel in channels)
+        self.serial_factory = serial_factory
+        self.ser = None
+        self.parser = make_parser(protocol, len(channels))
+        self.retry_at = 0.0
+
+    def open(self):
+        self.ser = self.serial_factory(self.port, self.baudrate, timeout=0)
+        self.ser.reset_input_buffer()
+        self.parser.reset()
+        log.info("✅ Connected to %s at %s baud rate.", self.port, self.baudrate)
+
+    def close(self):
+        if self.ser and self.ser.is_open:
+            self.ser.close()
+        self.ser = None
+
+    def read_available(self, ready=False):
+        """Non-blocking: take whatever the driver holds and dispatch complete lines.
+
+        ``ready`` means the selector reported the port readable; reading then
+        even with nothing waiting lets pyserial notice an unplugged device.
+        """
+        waiting = self.ser.in_waiting
+        if not waiting and not ready:
+            return 0
+        chunk = self.ser.read(max(1, waiting))
+        if chunk:
+            self.handle_chunk(chunk, time.monotonic())
+        return len(chunk)
+
+    @property
+    def invalid_lines(self):
+        return self.parser.malformed
+
+    def handle_chunk(self, chunk, timestamp):
+        SERIAL_BYTES.inc(len(chunk))
+        self.parser.feed(chunk, timestamp, self.buffers)
+
+class AcquisitionService:
+    """Reads N serial ports with N channels each from a single thread.
+
+    ``ports`` is a list of dicts like ``{"port": "COM3", "baudrate": 115200,
+    "channels": ["T1", "T2"], "protocol": "text"}``; channel names must be unique. On POSIX the thread
+    blocks in a selector over every port's file descriptor; Windows COM handles
+    cannot be selected, so there the same thread sweeps ``in_waiting`` on each port
+    and naps briefly only when all of them are idle.
+    """
+
+    def __init__(self, ports, buffer_capacity=1 << 20, serial_factory=serial.Serial,
+                 retry_interval=2.0, idle_sleep=0.002):
+        self.channels = {}
+        self.readers = []
+        for config in ports:
+            names = config.get("channels") or [config["port"]]
+            channels = []
+            for name in names:
+                if name in self.channels:
+                    raise ValueError(f"Duplicate channel name {name!r}")
+                self.channels[name] = Channel(name, buffer_capacity, self)
+                channels.append(self.channels[name])
+            reader = PortReader(config["port"], config.get("baudrate", 115200), channels, serial_factory,
+                                config.get("protocol", "text"))
+            for channel in channels:
+                channel.port_reader = reader
+            self.readers.append(reader)
+        self.retry_interval = retry_interval
+        self.idle_sleep = idle_sleep
+        self.use_selector = os.name != "nt"
+        self.selector = None
+        self.running = False
+        self.stop_event = Event()
+        atexit.register(self.stop_reading)
+
+    def channel(self, name):
+        return self.channels[name]
+
+    def start_reading(self):
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        if self.use_selector:
+            self.selector = selectors.DefaultSelector()
+        while self.running and not self.stop_event.is_set():
+            self.open_due_ports()
+            if self.use_selector and self.selector.get_map():
+                for key, _ in self.selector.select(timeout=0.1):
+                    self.read(key.data, ready=True)
+            else:
+                busy = False
+                for reader in self.readers:
+                    if reader.ser is not None:
+                        busy = self.read(reader) or busy
+                if not busy:
+                    time.sleep(self.idle_sleep if any(r.ser for r in self.readers) else 0.1)
+        for reader in self.readers:
+            self.drop(reader)
+        if self.selector:
+            self.selector.close()
+
+    def open_due_ports(self):
+        now = time.monotonic()
+        for reader in self.readers:
+            if reader.ser is not None or now < reader.retry_at:
+                continue
+            try:
+                reader.open()
+            except serial.SerialException as e:
+                log.warning("❌ Serial Error on %s: %s", reader.port, e)
+                reader.retry_at = now + self.retry_interval
+                continue
+            if self.use_selector:
+                self.selector.register(reader.ser.fileno(), selectors.EVENT_READ, reader)
+
+    def read(self, reader, ready=False):
+        try:
+            return reader.read_available(ready)
+        except (serial.SerialException, OSError):
+            log.warning("🔌 Serial Error: Lost connection to %s, will retry...", reader.port)
+            self.drop(reader)
+            reader.retry_at = time.monotonic() + self.retry_interval
+            return 0
+
+    def drop(self, reader):
+        if reader.ser is None:
+            return
+        if self.selector:
+            try:
+                self.selector.unregister(reader.ser.fileno())
+            except (KeyError, ValueError, OSError):
+                pass
+        reader.close()
+
+    def stop_reading(self):
+        self.running = False
+        self.stop_event.set()
@@ -1,39 +1,77 @@
 import serial
 import time
 import atexit
-from threading import Thread, Event, Lock
+import logging
+from threading import Thread, Event
+from sensors.sample_buffer import SampleBuffer
+from sensors.source import SensorSource
+from sensors.line_parser import make_parser
+from monitoring.metrics import SERIAL_BYTES
 
-class ArduinoReader:
-    def __init__(self, port='COM3', baudrate=115200):
+log = logging.getLogger(__name__)
+
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+CONNECTED = "connected"
+
+class ArduinoReader(SensorSource):
+    def __init__(self, port='COM3', baudrate=115200, serial_factory=serial.Serial, read_timeout=0.05,
+                 buffer_capacity=1 << 20, backoff_initial=0.01, backoff_max=0.25, protocol="text"):
         self.port = port
         self.baudrate = baudrate
+        # serial_factory يسمح باستبدال serial.Serial بمنفذ وهمي (pty أو loopback) للاختبار
+        self.serial_factory = serial_factory
+        self.read_timeout = read_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
         self.ser = None
         self.running = False
-        self.latest_temperature = None
-        self.previous_temperature = None
-        self.lock = Lock()
+        # حلقة ثابتة الحجم: ذاكرة محدودة حتى في ورديات 12 ساعة
+        self.buffer = SampleBuffer(buffer_capacity)
+        self.state = DISCONNECTED
+        self.state_listeners = []
+        # [(lost_at, restored_at)] in monotonic time; restored_at is None while still down
+        self.gaps = []
         self.stop_event = Event()
+        # protocol="binary" للبرامج الثابتة التي ترسل إطارات ثنائية (انظر sensors.line_parser)
+        self.parser = make_parser(protocol)
         atexit.register(self.cleanup)
 
+    def add_state_listener(self, callback):
+        """``callback(state)`` is called from the reader thread on every state change."""
+        self.state_listeners.append(callback)
+
+    def set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        for callback in self.state_listeners:
+            callback(state)
+
     def connect(self):
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                if self.ser and self.ser.is_open:
-                    self.ser.close()
-                self.ser = serial.Serial(self.port, self.baudrate, timeout=1)
-                time.sleep(2)
-                self.ser.reset_input_buffer()
-                print(f"✅ Connected to {self.port} at {self.baudrate} baud rate.")
-                return True
-            except serial.SerialException as e:
-                print(f"❌ Serial Error [{attempt+1}/{max_retries}]: {e}")
-                time.sleep(2)
-        print("❌ Failed to connect to Arduino.")
-        return False
+        """One non-blocking attempt to open the port; the read thread handles retries."""
+        self.set_state(CONNECTING)
+        try:
+            if self.ser and self.ser.is_open:
+                self.ser.close()
+            # No settle delay after opening: a line cut short by the Arduino's reset
+            # on open is simply rejected by the parser.
+            self.ser = self.serial_factory(self.port, self.baudrate, timeout=self.read_timeout)
+            self.ser.reset_input_buffer()
+        except serial.SerialException:
+            # stays CONNECTING while the read thread keeps retrying
+            self.ser = None
+            return False
+        self.parser.reset()
+        if self.gaps and self.gaps[-1][1] is None:
+            self.gaps[-1] = (self.gaps[-1][0], time.monotonic())
+        self.set_state(CONNECTED)
+        log.info("✅ Connected to %s at %s baud rate.", self.port, self.baudrate)
+        return True
 
     def start_reading(self):
-        if not self.connect():
+        """Start the read thread and return at once; connecting happens in the background."""
+        if self.running:
             return
         self.running = True
         self.stop_event.clear()
@@ -41,34 +79,59 @@ class ArduinoReader:
         self.thread.start()
 
     def read_loop(self):
+        """Block on the port and drain every complete line as soon as it arrives.
+
+        While the port is down, reconnect with exponential backoff from
+        ``backoff_initial`` up to ``backoff_max`` seconds, so a returning device
+        is picked up within one backoff step.
+        """
+        attempt = 0
         while self.running and not self.stop_event.is_set():
+            if self.ser is None:
+                if self.connect():
+                    attempt = 0
+                else:
+                    if attempt == 0:
+                        log.warning("❌ Serial Error: %s unavailable, retrying in the background...", self.port)
+                    self.stop_event.wait(min(self.backoff_max, self.backoff_initial * 2 ** attempt))
+                    attempt += 1
+                continue
             try:
-                if self.ser and self.ser.in_waiting > 0:
-                    data = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    if self.is_valid_temperature(data):
-                        temp = round(float(data), 2)
-                        with self.lock:
-                            self.previous_temperature = self.latest_temperature
-                            self.latest_temperature = temp
-                            print(f"🌡 Updated Temperature: {self.latest_temperature} °C")
-            except serial.SerialException:
-                print("🔌 Serial Error: Lost connection, attempting to reconnect...")
-                self.connect()
-            except ValueError:
-                print("⚠ Invalid numeric conversion")
-            time.sleep(1)
+                # read() blocks up to read_timeout for the first byte, then we take
+                # everything already buffered so bursts are handled in one pass.
+                chunk = self.ser.read(max(1, self.ser.in_waiting))
+                if chunk:
+                    self.handle_chunk(chunk, time.monotonic())
+            except (serial.SerialException, OSError):
+                log.warning("🔌 Serial Error: Lost connection, attempting to reconnect...")
+                self.mark_disconnected()
         self.cleanup()
 
-    def is_valid_temperature(self, data):
+    def mark_disconnected(self):
+        lost_at = time.monotonic()
         try:
-            float(data)
-            return True
-        except ValueError:
-            return False
+            self.ser.close()
+        except (serial.SerialException, OSError):
+            pass
+        self.ser = None
+        # NaN in the stream marks the gap: the plot breaks the line there
+        self.buffer.append(lost_at, float("nan"))
+        self.gaps.append((lost_at, None))
+        self.set_state(DISCONNECTED)
+
+    def handle_chunk(self, chunk, timestamp):
+        """Parse raw bytes straight into the buffer.
 
-    def get_latest_temperature(self):
-        with self.lock:
-            return self.latest_temperature
+        All samples completed by the same chunk share its monotonic receipt time.
+        A trailing partial line or frame is kept until the rest of it arrives.
+        """
+        SERIAL_BYTES.inc(len(chunk))
+        malformed = self.parser.malformed
+        samples = self.parser.feed(chunk, timestamp, (self.buffer,))
+        if self.parser.malformed != malformed:
+            log.warning("⚠ Invalid numeric conversion: %d malformed sample(s) so far", self.parser.malformed)
+        if samples and log.isEnabledFor(logging.DEBUG):
+            log.debug("🌡 Updated Temperature: %s °C", self.get_latest_temperature())
 
     def stop_reading(self):
         self.running = False
@@ -78,4 +141,5 @@ class ArduinoReader:
     def cleanup(self):
         if self.ser and self.ser.is_open:
             self.ser.close()
-            print("🔌 Serial connection closed safely.")
+            log.info("🔌 Serial connection closed safely.")
+        self.set_state(DISCONNECTED)
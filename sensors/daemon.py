@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+import signal
+import logging
+import argparse
+from threading import Event
+from concurrent.futures import ThreadPoolExecutor
+from sensors.factory import load_config, channel_names, create_sources
+from sensors.shared_buffer import SharedSampleBuffer, shared_name, PREFIX, STATES, HEARTBEAT_TIMEOUT
+from storage.session_recorder import SessionRecorder, analyze_recording
+from storage.catalog import SessionCatalog
+
+log = logging.getLogger(__name__)
+
+class PublishedChannel:
+    """One source, the shared ring it is published to, and its recorder."""
+
+    def __init__(self, name, source, shared, recorder):
+        self.name = name
+        self.source = source
+        self.shared = shared
+        self.recorder = recorder
+        self.cursor = source.buffer.cursor()
+        self.active = False
+
+    def publish(self, now):
+        timestamps, values, self.cursor = self.source.buffer.read_since(self.cursor)
+        if len(values):
+            self.shared.extend(timestamps, values)
+        self.shared.set("state", STATES.index(self.source.state))
+        self.shared.set("heartbeat", now)
+
+class AcquisitionDaemon:
+    """Headless process that owns the ports and the recordings.
+
+    Every channel is copied from its source ring into a SharedSampleBuffer named
+    ``<prefix>-<channel>`` every ``publish_interval`` seconds. The UI and any
+    other tool attach to it (sensors.remote.RemoteSource) and read it with their
+    own cursor, so clients cost the daemon nothing and one that freezes or
+    crashes never stalls acquisition. A client that attaches mid-run backfills
+    from the ring, which holds ``capacity`` samples.
+
+    Clients ask for a recording by setting ``record`` in the ring header. The
+    daemon records the channel with a SessionRecorder, publishes the path and
+    start time, and analyses and catalogs the session when it ends.
+    """
+
+    def __init__(self, config, prefix=PREFIX, data_dir="data", publish_interval=0.005, capacity=1 << 20):
+        self.publish_interval = publish_interval
+        self.catalog = SessionCatalog(os.path.join(data_dir, "catalog.sqlite"))
+        self.analysis_executor = ThreadPoolExecutor(max_workers=1)
+        self.stop_event = Event()
+        sources = create_sources(config)
+        self.channels = []
+        for name, source in sources.items():
+            shared = SharedSampleBuffer(shared_name(name, prefix), capacity, create=True)
+            pid = shared.get("pid")
+            if pid != os.getpid() and time.monotonic() - shared.get("heartbeat") < HEARTBEAT_TIMEOUT:
+                shared.close()
+                raise RuntimeError(f"Channel {name!r} is already published by daemon pid {pid}")
+            shared.set("pid", os.getpid())
+            shared.set("recording", 0)
+            # مع أكثر من قناة لكل قناة مجلدها حتى لا تتصادم أسماء الملفات
+            folder = os.path.join(data_dir, name) if len(sources) > 1 else data_dir
+            recorder = SessionRecorder(source.buffer, folder, catalog=self.catalog, channel=name)
+            self.channels.append(PublishedChannel(name, source, shared, recorder))
+
+    def run(self):
+        for channel in self.channels:
+            channel.source.start_reading()
+            if channel.shared.get("record"):
+                log.info("💾 Resuming the recording requested for %s", channel.name)
+        log.info("📡 Publishing %s", ", ".join(c.shared.name for c in self.channels))
+        while not self.stop_event.wait(self.publish_interval):
+            now = time.monotonic()
+            for channel in self.channels:
+                channel.publish(now)
+                self.poll_recording(channel)
+        self.shutdown()
+
+    def poll_recording(self, channel):
+        wanted = channel.shared.get("record")
+        if wanted and not channel.active and not channel.recorder.is_recording():
+            path = channel.recorder.start()
+            channel.active = True
+            channel.shared.set("path", os.path.abspath(path))
+            channel.shared.set("record_started", channel.recorder.start_time)
+            channel.shared.set("recording", 1)
+        elif not wanted and channel.active:
+            self.finish_recording(channel)
+
+    def finish_recording(self, channel):
+        recorder = channel.recorder
+        path, thread = recorder.path, recorder.thread
+        recorder.stop()
+        channel.active = False
+        channel.shared.set("recording", 0)
+        self.analysis_executor.submit(analyze_recording, path, thread, self.catalog)
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+    def shutdown(self):
+        for channel in self.channels:
+            channel.source.stop_reading()
+            if channel.active:
+                self.finish_recording(channel)
+            # a clean stop forgets the request; after a crash it is left set so a restart resumes recording
+            channel.shared.set("record", 0)
+            channel.shared.set("state", STATES.index("disconnected"))
+            channel.shared.set("heartbeat", 0.0)
+        self.analysis_executor.shutdown(wait=True)
+        # the segments stay, so attached clients keep their cursors across a restart
+        for channel in self.channels:
+            channel.shared.close()
+        log.info("🛑 Acquisition daemon stopped")
+
+def cleanup(config, prefix=PREFIX):
+    """Remove the shared rings of ``config``'s channels once no daemon or client needs them."""
+    for name in channel_names(config):
+        try:
+            shared = SharedSampleBuffer(shared_name(name, prefix))
+        except FileNotFoundError:
+            continue
+        shared.close()
+        shared.unlink()
+        print(f"[SUCCESS] Removed {shared.name}")
+
+def main(argv):
+    from monitoring.log import setup_logging
+    from monitoring.metrics import start_http_server
+    parser = argparse.ArgumentParser(description="Headless acquisition daemon")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--prefix", default=PREFIX)
+    parser.add_argument("--cleanup", action="store_true", help="remove the shared rings and exit")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.cleanup:
+        cleanup(config, args.prefix)
+        return
+    setup_logging()
+    # "daemon_metrics_port": 9109; the UI keeps "metrics_port" for itself
+    if config.get("daemon_metrics_port"):
+        start_http_server(config["daemon_metrics_port"])
+    try:
+        daemon = AcquisitionDaemon(config, args.prefix, args.data)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, daemon.stop)
+    daemon.run()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,37 @@
+import json
+from sensors.arduino_reader import ArduinoReader
+from sensors.acquisition import AcquisitionService
+from sensors.simulated import ReplaySource, SyntheticSource
+
+DEFAULT_CHANNEL = "temperature"
+
+def load_config(path="config.json"):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def channel_names(config):
+    """Names the sources of ``config`` are published under, in port order."""
+    if config.get("ports"):
+        names = []
+        for port in config["ports"]:
+            names.extend(port.get("channels") or [port["port"]])
+        return names
+    return [config.get("channel") or DEFAULT_CHANNEL]
+
+def create_sources(config):
+    """{channel name: SensorSource} for ``config``, not started yet."""
+    # "ports": [{"port": "COM3", "baudrate": 115200, "channels": ["T1", "T2"]}, ...]
+    if config.get("ports"):
+        return dict(AcquisitionService(config["ports"]).channels)
+    # "replay": "data/2025-02-09/temperature_21-57-33.csv" with optional "speed" (1-1000)
+    if config.get("replay"):
+        source = ReplaySource(config["replay"], speed=config.get("speed", 1.0), loop=True)
+    # "simulate": samples per second of a synthetic tempering curve
+    elif config.get("simulate"):
+        source = SyntheticSource(rate_hz=config["simulate"])
+    else:
+        source = ArduinoReader()
+    return {channel_names(config)[0]: source}
@@ -0,0 +1,168 @@
+import numpy as np
+from monitoring.metrics import SERIAL_LINES, PARSE_ERRORS
+
+# the bytes bytes.split() treats as separators
+WHITESPACE = np.zeros(256, dtype=bool)
+WHITESPACE[list(b" \t\n\r\x0b\x0c")] = True
+
+class TextLineParser:
+    """Parses newline-terminated ``v1[,v2,...]`` text straight into sample buffers.
+
+    Each chunk is cut at its last newline and every complete line is converted in
+    one NumPy call, so the per-sample cost is C-level with no str objects or
+    exceptions. Only a chunk that contains a malformed line is reparsed line by
+    line, and each malformed line is counted in ``malformed``.
+    """
+
+    def __init__(self, columns=1, decimals=2):
+        self.columns = columns
+        self.decimals = decimals
+        self.pending = bytearray()
+        self.lines = 0
+        self.malformed = 0
+
+    def reset(self):
+        self.pending.clear()
+
+    def feed(self, chunk, timestamp, buffers):
+        """Parse ``chunk``; ``buffers`` has one SampleBuffer per column. Returns samples per column."""
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            self.pending += chunk
+            return 0
+        if self.pending:
+            block = bytes(self.pending) + chunk[:end]
+            self.pending.clear()
+        else:
+            block = chunk[:end]
+        self.pending += chunk[end + 1:]
+
+        if self.columns > 1:
+            block = block.replace(b',', b' ')
+        tokens = block.split()
+        lines = block.count(b'\n') + 1
+        self.lines += lines
+        SERIAL_LINES.inc(lines)
+        if not tokens:
+            return 0
+        try:
+            if len(tokens) != lines * self.columns or not self.fields_match(block, lines):
+                raise ValueError("ragged lines")
+            values = np.array(tokens).astype(np.float64).reshape(-1, self.columns)
+        except ValueError:
+            values = self.parse_lines(block)
+            if values is None:
+                return 0
+        np.round(values, self.decimals, out=values)
+        for column, buffer in enumerate(buffers):
+            buffer.extend(timestamp, values[:, column])
+        return len(values)
+
+    def fields_match(self, block, lines):
+        """True when every line of ``block`` has exactly ``columns`` fields, counted without splitting it."""
+        data = np.frombuffer(block, dtype=np.uint8)
+        space = WHITESPACE[data]
+        starts = ~space
+        starts[1:] &= space[:-1]
+        line_of = np.cumsum(data == 10)
+        return bool((np.bincount(line_of[starts], minlength=lines) == self.columns).all())
+
+    def parse_lines(self, block):
+        rows = []
+        for line in block.split(b'\n'):
+            fields = line.split()
+            if not fields:
+                continue
+            try:
+                if len(fields) != self.columns:
+                    raise ValueError
+                rows.append([float(field) for field in fields])
+            except ValueError:
+                self.malformed += 1
+                PARSE_ERRORS.inc()
+        return np.array(rows, dtype=np.float64) if rows else None
+
+# Binary framing, one frame per sample, little-endian:
+#   byte 0     0xA5 sync
+#   byte 1     sequence number, +1 per frame (wraps at 256); a jump means frames were lost
+#   bytes 2-3  int16 temperature in hundredths of a degree (-327.68 .. 327.67 °C)
+#   byte 4     checksum = (bytes 1 + 2 + 3) & 0xFF, then XOR 0xFF
+# Firmware: Serial.write(frame, 5) instead of Serial.println(temp).
+SYNC = 0xA5
+FRAME = np.dtype([("sync", "u1"), ("seq", "u1"), ("value", "<i2"), ("check", "u1")])
+
+def encode_frames(values, start_seq=0):
+    """Build frames for ``values`` (°C); used by simulators and to document the format."""
+    frames = np.zeros(len(values), dtype=FRAME)
+    frames["sync"] = SYNC
+    frames["seq"] = (start_seq + np.arange(len(values))) & 0xFF
+    frames["value"] = np.round(np.asarray(values) * 100).astype(np.int16)
+    raw = frames.view(np.uint8).reshape(-1, FRAME.itemsize)
+    frames["check"] = (raw[:, 1:4].sum(axis=1) & 0xFF) ^ 0xFF
+    return frames.tobytes()
+
+class BinaryFrameParser:
+    """Decodes 5-byte checksummed frames (see above) in bulk.
+
+    Aligned runs of frames are viewed as a structured array, with no copy and
+    no Python per frame. A frame with a bad sync byte or checksum is counted in
+    ``malformed``, and the parser searches for the next sync byte that starts a
+    valid frame. Sequence jumps are counted in ``lost``.
+    """
+
+    columns = 1
+
+    def __init__(self):
+        self.pending = bytearray()
+        self.last_seq = None
+        self.lines = 0
+        self.malformed = 0
+        self.lost = 0
+
+    def reset(self):
+        self.pending.clear()
+        self.last_seq = None
+
+    def feed(self, chunk, timestamp, buffers):
+        data = self.pending + chunk if self.pending else bytes(chunk)
+        self.pending = bytearray()
+        size = FRAME.itemsize
+        position = 0
+        accepted = 0
+        while len(data) - position >= size:
+            count = (len(data) - position) // size
+            frames = np.frombuffer(data, dtype=FRAME, count=count, offset=position)
+            raw = frames.view(np.uint8).reshape(-1, size)
+            valid = (frames["sync"] == SYNC) & ((raw[:, 1:4].sum(axis=1, dtype=np.uint32) & 0xFF) ^ 0xFF == frames["check"])
+            good = count if valid.all() else int(np.argmin(valid))
+            if good:
+                accepted += self.accept(frames[:good], timestamp, buffers)
+                position += good * size
+            if good < count:
+                # lost alignment: skip to the next sync byte that starts a valid frame
+                self.malformed += 1
+                PARSE_ERRORS.inc()
+                next_sync = data.find(bytes([SYNC]), position + 1)
+                position = len(data) if next_sync < 0 else next_sync
+        self.pending += data[position:]
+        return accepted
+
+    def accept(self, frames, timestamp, buffers):
+        seq = frames["seq"].astype(np.int16)
+        if self.last_seq is not None:
+            expected = np.concatenate(([self.last_seq], seq[:-1])) + 1
+            self.lost += int(((seq - expected) & 0xFF).sum())
+        self.last_seq = int(seq[-1])
+        self.lines += len(frames)
+        SERIAL_LINES.inc(len(frames))
+        buffers[0].extend(timestamp, frames["value"] / 100.0)
+        return len(frames)
+
+def make_parser(protocol="text", columns=1):
+    if protocol == "binary":
+        if columns != 1:
+            raise ValueError("The binary protocol carries one channel per port")
+        return BinaryFrameParser()
+    if protocol != "text":
+        raise ValueError(f"Unknown protocol {protocol!r}, expected 'text' or 'binary'")
+    return TextLineParser(columns)
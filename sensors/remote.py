@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import subprocess
+from sensors.source import SensorSource
+from sensors.factory import channel_names
+from sensors.shared_buffer import SharedSampleBuffer, shared_name, PREFIX, STATES, HEARTBEAT_TIMEOUT
+
+class RemoteSource(SensorSource):
+    """A channel published by the acquisition daemon (sensors.daemon), read from shared memory.
+
+    ``buffer`` is the daemon's ring itself, so cursors, ``read_since`` and
+    ``cursor_since`` work as with a local source. Acquisition belongs to the
+    daemon: start and stop do nothing here.
+    """
+
+    def __init__(self, channel, prefix=PREFIX, timeout=0.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.buffer = SharedSampleBuffer(shared_name(channel, prefix))
+                break
+            except FileNotFoundError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        self.name = channel
+
+    def alive(self):
+        return time.monotonic() - self.buffer.get("heartbeat") < HEARTBEAT_TIMEOUT
+
+    @property
+    def state(self):
+        return STATES[self.buffer.get("state")] if self.alive() else "disconnected"
+
+    def start_reading(self):
+        pass
+
+    def stop_reading(self):
+        pass
+
+    def get_latest_temperature(self):
+        return super().get_latest_temperature() if self.alive() else None
+
+    def close(self):
+        self.buffer.close()
+
+class RemoteRecorder:
+    """Stands in for SessionRecorder when the daemon records the channel.
+
+    ``start``/``stop`` only set the request flag in the ring header; the daemon
+    writes, catalogs and analyses the session, so there is no local ``thread``.
+    """
+
+    thread = None
+
+    def __init__(self, source, data_dir="data"):
+        self.buffer = source.buffer
+        self.data_dir = data_dir
+
+    def start(self):
+        self.buffer.set("record", 1)
+
+    def stop(self, wait=False, timeout=10.0):
+        self.buffer.set("record", 0)
+        deadline = time.monotonic() + timeout
+        while wait and self.is_recording() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def is_recording(self):
+        return bool(self.buffer.get("recording"))
+
+    @property
+    def path(self):
+        return self.buffer.get("path") or None
+
+    @property
+    def started_at(self):
+        """Monotonic time the daemon's current recording started."""
+        return self.buffer.get("record_started")
+
+def spawn_daemon(data_dir="data"):
+    """Start ``python -m sensors.daemon`` detached from this process, logging to data/daemon.log."""
+    os.makedirs(data_dir, exist_ok=True)
+    if os.name == "nt":
+        options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        options = {"start_new_session": True}
+    with open(os.path.join(data_dir, "daemon.log"), "ab") as log_file:
+        return subprocess.Popen([sys.executable, "-m", "sensors.daemon", "--data", data_dir],
+                                stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT, **options)
+
+def connect(config, data_dir="data", timeout=10.0):
+    """RemoteSource for the configured channel, starting the daemon first when nobody publishes it."""
+    channel = config.get("channel") or channel_names(config)[0]
+    spawned = False
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            source = RemoteSource(channel)
+            if source.alive():
+                return source
+            # stale ring from a daemon that is gone; it may be recreated, so attach afresh each time
+            source.close()
+        except FileNotFoundError:
+            pass
+        if not spawned:
+            spawn_daemon(data_dir)
+            spawned = True
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"No acquisition daemon published {channel!r} within {timeout:g} s")
+        time.sleep(0.1)
@@ -0,0 +1,87 @@
+import numpy as np
+
+class SampleBuffer:
+    """Fixed-capacity ring of (timestamp, value) samples.
+
+    One writer (the serial thread) appends; any number of readers keep their own
+    cursor and pull everything written since. ``written`` is only advanced after
+    the data is in place, so readers never need a lock: they see either the old
+    count or the new one, and the slots behind either are complete.
+    """
+
+    def __init__(self, capacity=1 << 20):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.written = 0
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, timestamp, value):
+        i = self.written % self.capacity
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.written += 1
+
+    def extend(self, timestamps, values):
+        """Append a batch; ``timestamps`` may be one scalar shared by every value."""
+        n = len(values)
+        if n == 0:
+            return
+        if np.ndim(timestamps) == 0:
+            timestamps = np.broadcast_to(np.float64(timestamps), (n,))
+        if n > self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+        i = self.written % self.capacity
+        first = min(n, self.capacity - i)
+        self.timestamps[i:i + first] = timestamps[:first]
+        self.values[i:i + first] = values[:first]
+        if first < n:
+            self.timestamps[:n - first] = timestamps[first:]
+            self.values[:n - first] = values[first:]
+        self.written += n
+
+    def cursor(self):
+        """Cursor positioned at the current end, i.e. "only new samples from now on"."""
+        return self.written
+
+    def cursor_since(self, timestamp):
+        """Cursor of the oldest held sample stamped at or after ``timestamp``, for backfilling a late reader."""
+        low, high = max(0, self.written - self.capacity), self.written
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[middle % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def latest(self):
+        """Most recent (timestamp, value), or None before the first sample."""
+        written = self.written
+        if written == 0:
+            return None
+        i = (written - 1) % self.capacity
+        return float(self.timestamps[i]), float(self.values[i])
+
+    def read_since(self, cursor):
+        """Return (timestamps, values, new_cursor) for everything after ``cursor``.
+
+        The arrays are views into the ring when the range does not wrap, and a
+        copy when it does; consume them before the writer laps the buffer. A
+        reader that fell more than ``capacity`` samples behind skips ahead to the
+        oldest sample still held.
+        """
+        written = self.written
+        start = max(cursor, written - self.capacity)
+        if start >= written:
+            empty = self.values[:0]
+            return empty, empty, written
+        i, j = start % self.capacity, written % self.capacity
+        if i < j:
+            return self.timestamps[i:j], self.values[i:j], written
+        return (np.concatenate((self.timestamps[i:], self.timestamps[:j])),
+                np.concatenate((self.values[i:], self.values[:j])), written)
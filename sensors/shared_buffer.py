@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from multiprocessing import shared_memory
+from sensors.sample_buffer import SampleBuffer
+
+PREFIX = "chocomonitor"
+MAGIC = b"CHOCORNG"
+STATES = ("disconnected", "connecting", "connected")
+# One header record, then the timestamp and value arrays of the ring.
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("capacity", "<i8"),
+    ("written", "<i8"),
+    ("heartbeat", "<f8"),        # daemon's time.monotonic() at its last publish
+    ("state", "<i8"),            # index into STATES
+    ("pid", "<i8"),
+    ("record", "<i8"),           # 1 = a client asks the daemon to record this channel
+    ("recording", "<i8"),        # 1 = the daemon is recording it
+    ("record_started", "<f8"),   # monotonic time the current recording started
+    ("path", "S256"),            # CSV path of the current or last recording
+])
+HEADER_SIZE = 512
+# a daemon that has not published for this long is treated as gone
+HEARTBEAT_TIMEOUT = 2.0
+
+def shared_name(channel, prefix=PREFIX):
+    return f"{prefix}-{channel}"
+
+def untrack(shm):
+    # Python < 3.13 unlinks every segment a process touched when it exits, even
+    # ones it only attached to. The ring must outlive both clients and a crashed
+    # daemon, so it is left alone and removed only by ``unlink``.
+    if os.name == "posix":
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+class SharedSampleBuffer(SampleBuffer):
+    """SampleBuffer whose ring lives in named shared memory.
+
+    The daemon creates it and is the only writer. Any number of processes
+    attach and read with their own cursor, exactly like in-process readers, so
+    adding a client costs the writer nothing. ``written`` sits in the shared
+    header and is updated after the data, as in SampleBuffer.
+
+    A restarted daemon re-attaches to the segment it left behind and carries on
+    counting, so clients that stayed attached keep valid cursors.
+    """
+
+    def __init__(self, name, capacity=1 << 20, create=False):
+        size = HEADER_SIZE + 2 * 8 * capacity
+        shm = None
+        try:
+            shm = shared_memory.SharedMemory(name)
+            header = np.ndarray((), HEADER, buffer=shm.buf)
+            if header["magic"] != MAGIC or (create and (header["capacity"] != capacity or shm.size < size)):
+                if not create:
+                    raise ValueError(f"Shared memory {name!r} is not a ChocoMonitor ring")
+                del header
+                shm.close()
+                shm.unlink()
+                shm = None
+        except FileNotFoundError:
+            if not create:
+                raise
+        if shm is None:
+            shm = shared_memory.SharedMemory(name, create=True, size=size)
+            header = np.ndarray((), HEADER, buffer=shm.buf)
+            header["capacity"] = capacity
+            header["written"] = 0
+            header["magic"] = MAGIC
+        untrack(shm)
+        self.shm = shm
+        self.name = name
+        self.header = np.ndarray((), HEADER, buffer=shm.buf)
+        self.capacity = int(self.header["capacity"])
+        self.timestamps = np.ndarray(self.capacity, np.float64, buffer=shm.buf, offset=HEADER_SIZE)
+        self.values = np.ndarray(self.capacity, np.float64, buffer=shm.buf, offset=HEADER_SIZE + 8 * self.capacity)
+
+    @property
+    def written(self):
+        return int(self.header["written"])
+
+    @written.setter
+    def written(self, value):
+        self.header["written"] = value
+
+    def read_since(self, cursor):
+        """As SampleBuffer.read_since, but always a copy, trimmed of anything the writer lapped meanwhile."""
+        timestamps, values, written = super().read_since(cursor)
+        timestamps, values = np.array(timestamps), np.array(values)
+        lapped = self.written - self.capacity - (written - len(values))
+        if lapped > 0:
+            timestamps, values = timestamps[lapped:], values[lapped:]
+        return timestamps, values, written
+
+    def get(self, field):
+        value = self.header[field][()]
+        return value.decode() if isinstance(value, bytes) else value.item()
+
+    def set(self, field, value):
+        self.header[field] = value.encode() if isinstance(value, str) else value
+
+    def close(self):
+        self.header = self.timestamps = self.values = None
+        self.shm.close()
+
+    def unlink(self):
+        if os.name == "posix":
+            # SharedMemory.unlink unregisters the name again; keep the tracker's books balanced
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
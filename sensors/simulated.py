@@ -0,0 +1,169 @@
+import time
+import numpy as np
+from threading import Thread, Event
+from sensors.sample_buffer import SampleBuffer
+from sensors.source import SensorSource
+from storage.session_file import load_session
+from sensors.line_parser import encode_frames, FRAME
+
+# منحنى تمبرة نموذجي: (الزمن بالثواني، درجة الحرارة)
+TEMPERING_PROFILE = ((0, 20.0), (600, 48.0), (900, 48.0), (1500, 27.0), (1800, 27.0), (2100, 31.0), (3600, 31.0))
+
+def profile_temperature(seconds, profile=TEMPERING_PROFILE):
+    """Temperature of a repeating piecewise-linear profile at ``seconds`` (array or scalar)."""
+    times, temps = zip(*profile)
+    return np.interp(np.mod(seconds, times[-1]), times, temps)
+
+class ReplaySource(SensorSource):
+    """Plays a recorded session (.chs or .csv) back into a buffer at ``speed`` times real time."""
+
+    def __init__(self, path, speed=1.0, loop=False, buffer_capacity=1 << 20, batch_interval=0.01):
+        self.session = load_session(path)
+        self.speed = speed
+        self.loop = loop
+        self.batch_interval = batch_interval
+        self.buffer = SampleBuffer(buffer_capacity)
+        self.running = False
+        self.stop_event = Event()
+
+    def start_reading(self):
+        if self.running or not len(self.session):
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.state = "connected"
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        times = np.asarray(self.session.times, dtype=np.float64)
+        values = np.asarray(self.session.values, dtype=np.float64)
+        span = times[-1] - times[0]
+        offset = 0.0
+        start = time.monotonic()
+        while not self.stop_event.is_set():
+            position = 0
+            while position < len(times) and not self.stop_event.is_set():
+                # كل العينات التي حان وقتها تُدفع دفعة واحدة
+                now = time.monotonic()
+                due = (now - start) * self.speed + times[0] - offset
+                end = int(np.searchsorted(times, due, side="right"))
+                if end > position:
+                    stamps = start + (times[position:end] - times[0] + offset) / self.speed
+                    self.buffer.extend(stamps, values[position:end])
+                    position = end
+                self.stop_event.wait(self.batch_interval)
+            if not self.loop:
+                break
+            offset += span + (times[1] - times[0] if len(times) > 1 else 1.0)
+        self.running = False
+        self.state = "disconnected"
+
+    def stop_reading(self):
+        self.running = False
+        self.stop_event.set()
+
+class SyntheticSource(SensorSource):
+    """Generates a tempering curve plus noise at ``rate_hz`` samples per second.
+
+    Samples are produced in batches every ``batch_interval`` seconds, each
+    stamped with the monotonic time it was due, so the stream looks like a fast
+    sensor drained in bulk. ``time_scale`` speeds up the profile itself.
+    """
+
+    def __init__(self, rate_hz=100.0, noise=0.05, time_scale=1.0, profile=TEMPERING_PROFILE,
+                 buffer_capacity=1 << 20, batch_interval=0.005, seed=None):
+        self.rate_hz = rate_hz
+        self.noise = noise
+        self.time_scale = time_scale
+        self.profile = profile
+        self.batch_interval = batch_interval
+        self.buffer = SampleBuffer(buffer_capacity)
+        self.rng = np.random.default_rng(seed)
+        self.generated = 0
+        self.running = False
+        self.stop_event = Event()
+
+    def start_reading(self):
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.state = "connected"
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        start = time.monotonic()
+        # counted from this run's start; a restarted source would otherwise wait out the previous run
+        self.generated = 0
+        while not self.stop_event.is_set():
+            due = int((time.monotonic() - start) * self.rate_hz)
+            if due > self.generated:
+                stamps = start + np.arange(self.generated, due) / self.rate_hz
+                values = profile_temperature((stamps - start) * self.time_scale, self.profile)
+                if self.noise:
+                    values = values + self.rng.normal(0.0, self.noise, len(values))
+                self.buffer.extend(stamps, values)
+                self.generated = due
+            self.stop_event.wait(self.batch_interval)
+        self.state = "disconnected"
+
+    def stop_reading(self):
+        self.running = False
+        self.stop_event.set()
+
+class SimulatedSerial:
+    """Stand-in for serial.Serial that emits ``"<temp>\\n"`` lines at ``rate_hz``.
+
+    With ``protocol="binary"`` it sends 5-byte frames (sensors.line_parser)
+    instead. read() returns every sample that is due, whatever ``size`` is.
+
+    Pass ``SimulatedSerial.factory(rate_hz=...)`` as ArduinoReader's
+    ``serial_factory`` to exercise the real parsing path without hardware.
+    """
+
+    def __init__(self, port, baudrate, timeout=None, rate_hz=100.0, noise=0.05, profile=TEMPERING_PROFILE,
+                 protocol="text"):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.rate_hz = rate_hz
+        self.noise = noise
+        self.profile = profile
+        self.protocol = protocol
+        self.bytes_per_sample = FRAME.itemsize if protocol == "binary" else 6
+        self.rng = np.random.default_rng()
+        self.start = time.monotonic()
+        self.sent = 0
+        self.is_open = True
+
+    @classmethod
+    def factory(cls, **options):
+        return lambda port, baudrate, timeout=None: cls(port, baudrate, timeout, **options)
+
+    def reset_input_buffer(self):
+        self.sent = int((time.monotonic() - self.start) * self.rate_hz)
+
+    @property
+    def in_waiting(self):
+        return max(0, int((time.monotonic() - self.start) * self.rate_hz) - self.sent) * self.bytes_per_sample
+
+    def read(self, size=1):
+        deadline = time.monotonic() + (self.timeout or 0)
+        while True:
+            due = int((time.monotonic() - self.start) * self.rate_hz)
+            if due > self.sent or time.monotonic() >= deadline:
+                break
+            time.sleep(min(0.001, 1.0 / self.rate_hz))
+        if due <= self.sent:
+            return b""
+        seconds = (np.arange(self.sent, due) / self.rate_hz)
+        values = profile_temperature(seconds, self.profile) + self.rng.normal(0.0, self.noise, due - self.sent)
+        first, self.sent = self.sent, due
+        if self.protocol == "binary":
+            return encode_frames(values, first)
+        return "".join(f"{v:.2f}\n" for v in values).encode()
+
+    def close(self):
+        self.is_open = False
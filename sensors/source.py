@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+class SensorSource(ABC):
+    """What the UI, recorder and analytics need from a data source.
+
+    A source owns a ``buffer`` (sensors.sample_buffer.SampleBuffer) that only its
+    own thread writes to, a ``state`` string, and start/stop. Consumers either read
+    the buffer with their own cursor or ask for the latest temperature.
+    """
+
+    state = "disconnected"
+
+    @abstractmethod
+    def start_reading(self):
+        """Start producing samples in the background and return immediately."""
+
+    @abstractmethod
+    def stop_reading(self):
+        """Stop producing samples."""
+
+    def get_latest_temperature(self):
+        latest = self.buffer.latest()
+        # NaN = gap marker: no current reading while disconnected
+        if latest is None or latest[1] != latest[1]:
+            return None
+        return latest[1]
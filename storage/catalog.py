@@ -0,0 +1,250 @@
+import os
+import re
+import sys
+import sqlite3
+import logging
+import datetime
+import contextlib
+from storage.session_file import EXTENSION, load_session, find_sessions
+
+log = logging.getLogger(__name__)
+
+CATALOG_PATH = os.path.join("data", "catalog.sqlite")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# أسماء المجلدات مختلطة: 2025-01-29 و 23.01.2025
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+TIME_PATTERN = re.compile(r"(\d{2})-(\d{2})-(\d{2})$")
+DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    stem TEXT UNIQUE NOT NULL,        -- path without extension; the CSV and .chs twins share it
+    csv_path TEXT,
+    binary_path TEXT,
+    started TEXT,                     -- local ISO time, YYYY-MM-DDTHH:MM:SS
+    duration REAL,
+    samples INTEGER,
+    channel TEXT,
+    mean_temp REAL,
+    min_temp REAL,
+    max_temp REAL,
+    temper_index REAL,
+    break_points INTEGER,
+    report TEXT,
+    analyzed TEXT,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE INDEX IF NOT EXISTS sessions_temper_index ON sessions (temper_index);
+CREATE TABLE IF NOT EXISTS reports (
+    path TEXT PRIMARY KEY,
+    day TEXT,                         -- YYYY-MM-DD whatever the folder naming
+    session_id INTEGER REFERENCES sessions (id),
+    mtime_ns INTEGER,
+    size INTEGER
+);
+CREATE INDEX IF NOT EXISTS reports_day ON reports (day);
+"""
+
+def parse_day(name):
+    """YYYY-MM-DD for a folder named in any of DATE_FORMATS, else None."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(name, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+def guess_started(path):
+    """Start time from the folder date and a ``..._HH-MM-SS`` file name, else the file's mtime."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = DATE_PATTERN.search(stem)
+    if match:
+        return f"{match[1]}T{match[2]}:{match[3]}:{match[4]}"
+    day = parse_day(os.path.basename(os.path.dirname(path)))
+    match = TIME_PATTERN.search(stem)
+    if day and match:
+        return f"{day}T{match[1]}:{match[2]}:{match[3]}"
+    return datetime.datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+
+def normalize(path):
+    # absolute, so the recorder, the batch CLI and the UI agree on one key per file
+    return os.path.abspath(path)
+
+class SessionCatalog:
+    """SQLite index of recorded sessions and result images.
+
+    The recorder adds a session when it closes the file, the analyzer fills in
+    the temper index and break points, and the report renderers register their
+    images. Each call opens its own short connection (WAL mode), so the
+    recorder, analysis and GUI threads can all use one catalog. ``import_tree``
+    fills it from existing data/ and results/ folders and skips files whose
+    mtime and size have not changed.
+    """
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self.connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=10.0)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def is_empty(self):
+        with self.connect() as db:
+            return db.execute("SELECT NOT EXISTS (SELECT 1 FROM sessions UNION ALL SELECT 1 FROM reports)").fetchone()[0]
+
+    def add_session(self, path, started=None, duration=None, samples=None, channel=None):
+        """Insert or refresh the session stored at ``path`` (its CSV or .chs)."""
+        stem, ext = os.path.splitext(normalize(path))
+        csv_path = stem + ".csv" if os.path.exists(stem + ".csv") else None
+        chs_path = stem + EXTENSION if os.path.exists(stem + EXTENSION) else None
+        st = os.stat(chs_path or csv_path or path)
+        with self.connect() as db:
+            # a guessed start time only fills a new row; it never replaces a recorded one
+            db.execute("""
+                INSERT INTO sessions (stem, csv_path, binary_path, started, duration, samples, channel, mtime_ns, size)
+                VALUES (:stem, :csv, :chs, COALESCE(:started, :guess), :duration, :samples, :channel, :mtime, :size)
+                ON CONFLICT (stem) DO UPDATE SET
+                    csv_path = excluded.csv_path, binary_path = excluded.binary_path,
+                    started = COALESCE(:started, started), duration = COALESCE(:duration, duration),
+                    samples = COALESCE(:samples, samples), channel = COALESCE(:channel, channel),
+                    mtime_ns = excluded.mtime_ns, size = excluded.size""",
+                {"stem": stem, "csv": csv_path, "chs": chs_path, "started": started, "guess": guess_started(path),
+                 "duration": duration, "samples": samples, "channel": channel,
+                 "mtime": st.st_mtime_ns, "size": st.st_size})
+            return db.execute("SELECT id FROM sessions WHERE stem = ?", (stem,)).fetchone()[0]
+
+    def record_analysis(self, path, summary, report=None):
+        """Store an analysis summary (``CurveAnalysis.summary()``) and its report for the session at ``path``."""
+        session_id = self.add_session(path, duration=summary.get("duration"), samples=summary.get("samples"))
+        with self.connect() as db:
+            db.execute("""
+                UPDATE sessions SET mean_temp = ?, min_temp = ?, max_temp = ?, temper_index = ?,
+                    break_points = ?, report = COALESCE(?, report), analyzed = ? WHERE id = ?""",
+                (summary.get("mean_temp"), summary.get("min_temp"), summary.get("max_temp"),
+                 summary.get("temper_index"), summary.get("break_points"),
+                 normalize(report) if report else None,
+                 datetime.datetime.now().isoformat(timespec="seconds"), session_id))
+        if report:
+            self.add_report(report, session_id)
+        return session_id
+
+    def add_report(self, path, session_id=None):
+        path = normalize(path)
+        st = os.stat(path)
+        folder = os.path.basename(os.path.dirname(path))
+        match = DATE_PATTERN.search(os.path.basename(path))
+        day = parse_day(folder) or (match[1] if match else
+                                    datetime.date.fromtimestamp(st.st_mtime).isoformat())
+        with self.connect() as db:
+            db.execute("""
+                INSERT INTO reports (path, day, session_id, mtime_ns, size) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET day = excluded.day, mtime_ns = excluded.mtime_ns,
+                    size = excluded.size, session_id = COALESCE(excluded.session_id, session_id)""",
+                (path, day, session_id, st.st_mtime_ns, st.st_size))
+
+    def sessions(self, since=None, until=None, min_index=None, max_index=None, channel=None):
+        """Sessions started in [since, until) (ISO dates or datetimes) matching the filters, oldest first."""
+        clauses, args = [], []
+        for clause, value in (("started >= ?", since), ("started < ?", until),
+                              ("temper_index >= ?", min_index), ("temper_index < ?", max_index),
+                              ("channel = ?", channel)):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self.connect() as db:
+            return [dict(row) for row in db.execute(f"SELECT * FROM sessions{where} ORDER BY started", args)]
+
+    def report_days(self):
+        with self.connect() as db:
+            return [row[0] for row in db.execute("SELECT DISTINCT day FROM reports ORDER BY day")]
+
+    def reports(self, day):
+        """[(path, mtime_ns, size)] of the result images of ``day``, sorted by name."""
+        with self.connect() as db:
+            rows = db.execute("SELECT path, mtime_ns, size FROM reports WHERE day = ?", (day,)).fetchall()
+        images = [tuple(row) for row in rows if row[0].lower().endswith(IMAGE_EXTENSIONS)]
+        return sorted(images, key=lambda image: os.path.basename(image[0]))
+
+    def known(self, table, key, value, st, analyzed=False):
+        """True when ``value`` is catalogued with ``st``'s mtime and size (and, with ``analyzed``, has been analysed)."""
+        condition = " AND analyzed IS NOT NULL" if analyzed else ""
+        with self.connect() as db:
+            row = db.execute(f"SELECT mtime_ns, size FROM {table} WHERE {key} = ?{condition}", (value,)).fetchone()
+        return row is not None and tuple(row) == (st.st_mtime_ns, st.st_size)
+
+    def import_tree(self, data_dir="data", results_dir="results", analyze=True):
+        """Catalog every session under ``data_dir`` and image under ``results_dir``; returns (sessions, reports) added."""
+        from algorithms.curve_analysis import analyze_curve
+        added_sessions = 0
+        for path in find_sessions(data_dir):
+            stem = os.path.splitext(path)[0]
+            # a quick import (analyze=False) leaves rows unanalysed; a full one must still fill them in
+            if self.known("sessions", "stem", normalize(stem), os.stat(path), analyzed=analyze):
+                continue
+            try:
+                session = load_session(path)
+            except ValueError as e:
+                log.error("❌ Could not catalog %s: %s", path, e)
+                continue
+            if not len(session):
+                continue
+            started = session.metadata.get("started")
+            if analyze:
+                self.record_analysis(path, analyze_curve(session.times, session.values).summary())
+            self.add_session(path, started=started, duration=float(session.times[-1] - session.times[0]),
+                             samples=len(session), channel=session.metadata.get("channel"))
+            added_sessions += 1
+
+        added_reports = 0
+        for root, dirs, files in os.walk(results_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                path = os.path.join(root, name)
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not self.known("reports", "path", normalize(path), os.stat(path)):
+                    self.add_report(path)
+                    added_reports += 1
+        return added_sessions, added_reports
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Session catalog")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    scan = commands.add_parser("import", help="catalog existing data/ and results/ trees")
+    scan.add_argument("--data", default="data")
+    scan.add_argument("--results", default="results")
+    query = commands.add_parser("query", help="list sessions, e.g. --since 2025-01-01 --max-index 5")
+    query.add_argument("--since")
+    query.add_argument("--until")
+    query.add_argument("--min-index", type=float)
+    query.add_argument("--max-index", type=float)
+    query.add_argument("--channel")
+    args = parser.parse_args(argv)
+
+    catalog = SessionCatalog(args.catalog)
+    if args.command == "import":
+        sessions, reports = catalog.import_tree(args.data, args.results)
+        print(f"[SUCCESS] Catalogued {sessions} session(s) and {reports} report(s) in {args.catalog}")
+        return
+    for row in catalog.sessions(args.since, args.until, args.min_index, args.max_index, args.channel):
+        print(f"{row['started']}  {row['duration'] or 0:9.1f} s  index {row['temper_index']}  "
+              f"breaks {row['break_points']}  {row['binary_path'] or row['csv_path']}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import struct
+import numpy as np
+
+# Layout: 16-byte preamble (magic, version, header size), JSON metadata padded
+# with spaces to HEADER_SIZE, then float64 (time, value) records appended forever.
+# A record torn by a crash is ignored on load because the sample count is taken
+# from the file size.
+MAGIC = b"CHOCOSES"
+VERSION = 1
+HEADER_SIZE = 4096
+PREAMBLE = struct.Struct("<8sII")
+EXTENSION = ".chs"
+RECORD = np.dtype([("time", "<f8"), ("value", "<f8")])
+
+class Session:
+    def __init__(self, path, times, values, metadata):
+        self.path = path
+        self.times = times
+        self.values = values
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.values)
+
+def binary_path(path):
+    return os.path.splitext(path)[0] + EXTENSION
+
+def encode_header(metadata):
+    body = json.dumps(metadata, ensure_ascii=True).encode("ascii")
+    if PREAMBLE.size + len(body) > HEADER_SIZE:
+        raise ValueError("Session metadata does not fit in the header")
+    return PREAMBLE.pack(MAGIC, VERSION, HEADER_SIZE) + body.ljust(HEADER_SIZE - PREAMBLE.size)
+
+def read_header(f):
+    magic, version, header_size = PREAMBLE.unpack(f.read(PREAMBLE.size))
+    if magic != MAGIC:
+        raise ValueError(f"{getattr(f, 'name', 'file')} is not a ChocoMonitor session")
+    if version > VERSION:
+        raise ValueError(f"Unsupported session version {version}")
+    return json.loads(f.read(header_size - PREAMBLE.size)), header_size
+
+class SessionWriter:
+    """Append-only writer; every append() is a single write of whole records."""
+
+    def __init__(self, path, metadata=None):
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        if new:
+            self.file.write(encode_header(metadata or {}))
+            self.file.flush()
+
+    def append(self, times, values):
+        records = np.empty(len(values), dtype=RECORD)
+        records["time"] = times
+        records["value"] = values
+        self.file.write(records.tobytes())
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+def write_session(path, times, values, metadata=None):
+    writer = SessionWriter(path, metadata)
+    writer.append(times, values)
+    writer.sync()
+    writer.close()
+    return path
+
+def load_session(path):
+    """Load a session; .chs files are memory-mapped, CSVs are parsed numerically.
+
+    The CSV header line is skipped rather than matched, so a mangled
+    ``Temperature (°C)`` encoding no longer matters.
+    """
+    if not path.endswith(EXTENSION):
+        return load_csv(path)
+    with open(path, "rb") as f:
+        metadata, header_size = read_header(f)
+    count = (os.path.getsize(path) - header_size) // RECORD.itemsize
+    if count <= 0:
+        empty = np.empty(0, dtype=np.float64)
+        return Session(path, empty, empty, metadata)
+    records = np.memmap(path, dtype=RECORD, mode="r", offset=header_size, shape=(count,))
+    return Session(path, records["time"], records["value"], metadata)
+
+def load_csv(path):
+    if os.path.getsize(path) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return Session(path, empty, empty, {"source": path})
+    # latin-1 maps every byte, so whatever encoding the header was saved in is skipped cleanly
+    data = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.float64, ndmin=2, encoding="latin-1")
+    if data.shape[1] < 2:
+        raise ValueError(f"{path} does not have time and temperature columns")
+    return Session(path, data[:, 0].copy(), data[:, 1].copy(), {"source": path})
+
+def find_sessions(data_dir="data"):
+    """Every non-empty session under ``data_dir``; a .chs wins over its CSV twin."""
+    sessions = {}
+    for root, _, files in os.walk(data_dir):
+        for name in files:
+            stem, ext = os.path.splitext(name)
+            if ext not in (EXTENSION, ".csv"):
+                continue
+            path = os.path.join(root, name)
+            if os.path.getsize(path) == 0:
+                continue
+            key = os.path.join(root, stem)
+            if ext == EXTENSION or key not in sessions:
+                sessions[key] = path
+    return sorted(sessions.values())
+
+def convert_csv(csv_path, overwrite=False):
+    """Write ``csv_path`` as a .chs next to it; returns the new path or None if skipped."""
+    out = binary_path(csv_path)
+    if os.path.exists(out) and not overwrite and os.path.getmtime(out) >= os.path.getmtime(csv_path):
+        return None
+    session = load_csv(csv_path)
+    if not len(session):
+        return None
+    tmp = out + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    write_session(tmp, session.times, session.values, {
+        "source": os.path.basename(csv_path),
+        "columns": ["Time (s)", "Temperature (C)"],
+    })
+    os.replace(tmp, out)
+    return out
+
+def convert_tree(data_dir="data", overwrite=False):
+    converted = []
+    for root, _, files in os.walk(data_dir):
+        for name in sorted(files):
+            if name.endswith(".csv"):
+                path = os.path.join(root, name)
+                try:
+                    out = convert_csv(path, overwrite)
+                except ValueError as e:
+                    print(f"[ERROR] {path}: {e}")
+                    continue
+                if out:
+                    converted.append(out)
+                    print(f"[SUCCESS] {path} -> {out}")
+    return converted
+
+if __name__ == "__main__":
+    convert_tree(sys.argv[1] if len(sys.argv) > 1 else "data")
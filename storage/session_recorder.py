@@ -0,0 +1,163 @@
+import os
+import time
+import atexit
+import logging
+import datetime
+import numpy as np
+from threading import Thread, Event
+from storage.session_file import SessionWriter, binary_path
+from storage.tiles import TileWriter
+from monitoring.metrics import RECORDER_FLUSH
+
+log = logging.getLogger(__name__)
+
+CSV_HEADER = "Time (s),Temperature (°C)\n"
+
+class SessionRecorder:
+    """Streams samples from a SampleBuffer to data/YYYY-MM-DD/temperature_HH-MM-SS.csv.
+
+    The same samples go to a .chs binary session next to the CSV (see
+    storage.session_file), which is what analysis loads, and into the
+    min/max/mean tile pyramid the history viewer reads (storage.tiles).
+
+    The files are created by the first flush that has samples, so a recording
+    stopped before any sample arrives leaves nothing behind, and a name already
+    taken on disk gets a ``_2``, ``_3``... suffix instead of being appended to.
+
+    A background thread wakes every ``flush_interval`` seconds, takes everything
+    new from the ring with its own cursor and appends it in one write followed by
+    fsync, so a crash loses at most one interval. The serial thread and the Qt
+    loop never touch the file; the ring is the only buffer, which keeps memory
+    bounded even if the disk stalls (samples the ring has overwritten by then are
+    counted in ``dropped``).
+    """
+
+    def __init__(self, buffer, data_dir="data", flush_interval=1.0, catalog=None, channel=None):
+        self.buffer = buffer
+        # catalog: storage.catalog.SessionCatalog that gets the session when its file is closed
+        self.catalog = catalog
+        self.channel = channel
+        self.data_dir = data_dir
+        self.flush_interval = flush_interval
+        self.path = None
+        self.file = None
+        self.samples_written = 0
+        self.dropped = 0
+        self.thread = None
+        self.stop_event = Event()
+        atexit.register(self.stop, wait=True)
+
+    def start(self):
+        if self.is_recording():
+            return self.path
+        if self.thread:
+            # the previous session is still draining; it reads self.path and friends until it closes
+            self.thread.join()
+        now = datetime.datetime.now()
+        self.path = self.free_path(now)
+        self.file = None
+        self.started = now.isoformat(timespec="seconds")
+        self.start_time = time.monotonic()
+        self.origin = time.time()
+        self.cursor = self.buffer.cursor()
+        self.samples_written = 0
+        self.dropped = 0
+        self.duration = 0.0
+        self.stop_event.clear()
+        self.thread = Thread(target=self.record_loop, daemon=True)
+        self.thread.start()
+        log.info("💾 Recording to %s", self.path)
+        return self.path
+
+    def free_path(self, now):
+        folder = os.path.join(self.data_dir, now.strftime("%Y-%m-%d"))
+        stem = os.path.join(folder, f"temperature_{now.strftime('%H-%M-%S')}")
+        path, n = stem + ".csv", 1
+        while os.path.exists(path) or os.path.exists(binary_path(path)):
+            n += 1
+            path = f"{stem}_{n}.csv"
+        return path
+
+    def open_files(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8", newline="")
+        self.file.write(CSV_HEADER)
+        self.binary = SessionWriter(binary_path(self.path), {
+            "started": self.started,
+            "channel": self.channel,
+            "columns": ["Time (s)", "Temperature (C)"],
+        })
+        self.tiles = TileWriter(self.path, self.origin, metadata={"channel": self.channel})
+
+    def record_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+        if self.file is None:
+            log.info("💾 Recording stopped before any sample; nothing saved")
+            return
+        self.file.close()
+        self.binary.close()
+        self.tiles.close()
+        log.info("💾 Recording saved: %s (%d samples, %d dropped)", self.path, self.samples_written, self.dropped)
+        if self.catalog and self.samples_written:
+            try:
+                self.catalog.add_session(self.path, started=self.started, duration=self.duration,
+                                         samples=self.samples_written, channel=self.channel)
+            except Exception as e:
+                log.error("❌ Could not catalog %s: %s", self.path, e)
+
+    def flush(self):
+        previous = self.cursor
+        timestamps, values, self.cursor = self.buffer.read_since(self.cursor)
+        self.dropped += self.cursor - previous - len(values)
+        finite = np.isfinite(values)
+        if not finite.all():
+            # gap markers from a reconnect; the jump in time already shows the gap
+            timestamps, values = timestamps[finite], values[finite]
+        if not len(values):
+            return
+        began = time.perf_counter()
+        if self.file is None:
+            self.open_files()
+        elapsed = timestamps - self.start_time
+        rows = np.column_stack((elapsed, values))
+        self.binary.append(elapsed, values)
+        self.tiles.append(elapsed, values)
+        np.savetxt(self.file, rows, fmt=("%.3f", "%.2f"), delimiter=",")
+        self.sync()
+        self.samples_written += len(values)
+        self.duration = float(elapsed[-1])
+        RECORDER_FLUSH.observe((time.perf_counter() - began) * 1000.0)
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.binary.sync()
+        self.tiles.sync()
+
+    def stop(self, wait=False):
+        """Signal the writer to drain and close; only blocks when ``wait`` is set."""
+        self.stop_event.set()
+        if wait and self.thread:
+            self.thread.join()
+
+    def is_recording(self):
+        """True from ``start`` until ``stop``, not while the last flush drains."""
+        return self.thread is not None and self.thread.is_alive() and not self.stop_event.is_set()
+
+def analyze_recording(path, thread, catalog=None):
+    """Analyse, report and catalog the session a recorder wrote at ``path``.
+
+    Meant for an analysis thread: it waits for the recorder's writer ``thread``
+    to drain, so acquisition never waits for the analysis.
+    """
+    # الاستيراد هنا حتى لا يحمل المسجل matplotlib
+    from algorithms.data_analysis import analyze_and_save
+    thread.join()
+    if not os.path.exists(binary_path(path)):
+        return  # stopped before any sample, so the recorder wrote nothing
+    try:
+        analyze_and_save(binary_path(path), catalog=catalog)
+    except Exception as e:
+        log.error("❌ Analysis of %s failed: %s", path, e)
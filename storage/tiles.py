@@ -0,0 +1,262 @@
+import os
+import sys
+import datetime
+import numpy as np
+from storage.session_file import EXTENSION, encode_header, read_header, load_session, find_sessions
+
+# مستويات الهرم بالثواني: كل ملف يحفظ min/max/mean لكل دلو زمني بهذا الطول
+LEVELS = (1, 10, 60, 600)
+TILE_EXTENSION = ".tile"
+# Buckets are aligned to the Unix epoch, so tiles of different sessions share
+# one grid and can be merged bucket by bucket.
+TILE = np.dtype([("time", "<f8"), ("min", "<f8"), ("max", "<f8"), ("mean", "<f8"), ("count", "<u4")])
+BACKFILL_CHUNK = 1 << 20
+
+def tile_path(session_path, level):
+    """``data/2025-02-09/temperature_21-57-33.csv`` -> ``...temperature_21-57-33.60s.tile``."""
+    return f"{os.path.splitext(session_path)[0]}.{level}s{TILE_EXTENSION}"
+
+def session_origin(session):
+    """Epoch seconds of the session's t=0, from its ``started`` metadata or its file name."""
+    from storage.catalog import guess_started
+    started = session.metadata.get("started") or guess_started(session.path)
+    return datetime.datetime.fromisoformat(started).timestamp()
+
+def aggregate(times, values, level):
+    """(bucket starts, min, max, sum, count) of ``values`` in ``level``-second buckets; ``times`` ascending."""
+    ids = np.floor(times / level)
+    starts = np.flatnonzero(np.diff(ids, prepend=np.nan))
+    counts = np.diff(np.append(starts, len(values)))
+    return (ids[starts] * level, np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts),
+            np.add.reduceat(values, starts), counts)
+
+class TileWriter:
+    """Appends min/max/mean tiles at every level while a session is recorded.
+
+    A bucket is written once a later sample shows it is complete. The bucket
+    still filling stays in memory and is written by ``close``. Files use the
+    .chs header (JSON metadata) followed by TILE records, so a torn record is
+    ignored the same way.
+    """
+
+    def __init__(self, session_path, origin, levels=LEVELS, metadata=None):
+        self.origin = origin
+        self.levels = levels
+        self.files = {}
+        self.pending = {}
+        for level in levels:
+            path = tile_path(session_path, level)
+            new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self.files[level] = open(path, "ab")
+            if new:
+                self.files[level].write(encode_header({**(metadata or {}), "level": level, "origin": origin,
+                                                       "session": os.path.basename(session_path)}))
+            self.pending[level] = None
+
+    def append(self, elapsed, values):
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        times = self.origin + np.asarray(elapsed, dtype=np.float64)[finite]
+        values = values[finite]
+        if not len(values):
+            return
+        for level in self.levels:
+            starts, mins, maxs, sums, counts = aggregate(times, values, level)
+            pending = self.pending[level]
+            if pending is not None:
+                if pending[0] == starts[0]:
+                    mins[0] = min(mins[0], pending[1])
+                    maxs[0] = max(maxs[0], pending[2])
+                    sums[0] += pending[3]
+                    counts[0] += pending[4]
+                else:
+                    self.write(level, *(np.array([field]) for field in pending))
+            self.pending[level] = (starts[-1], mins[-1], maxs[-1], sums[-1], counts[-1])
+            if len(starts) > 1:
+                self.write(level, starts[:-1], mins[:-1], maxs[:-1], sums[:-1], counts[:-1])
+
+    def write(self, level, starts, mins, maxs, sums, counts):
+        tiles = np.empty(len(starts), dtype=TILE)
+        tiles["time"], tiles["min"], tiles["max"] = starts, mins, maxs
+        tiles["mean"] = sums / counts
+        tiles["count"] = counts
+        self.files[level].write(tiles.tobytes())
+
+    def sync(self):
+        for f in self.files.values():
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self):
+        for level, pending in self.pending.items():
+            if pending is not None:
+                self.write(level, *(np.array([field]) for field in pending))
+            self.pending[level] = None
+        for f in self.files.values():
+            f.close()
+
+def load_tiles(path):
+    """(metadata, memory-mapped TILE records) of one tile file."""
+    with open(path, "rb") as f:
+        metadata, header_size = read_header(f)
+    count = (os.path.getsize(path) - header_size) // TILE.itemsize
+    if count <= 0:
+        return metadata, np.empty(0, dtype=TILE)
+    return metadata, np.memmap(path, dtype=TILE, mode="r", offset=header_size, shape=(count,))
+
+def build_tiles(session_path, levels=LEVELS, overwrite=False):
+    """Backfill tiles for a recorded session; returns the number of samples tiled, or 0 if up to date."""
+    paths = [tile_path(session_path, level) for level in levels]
+    mtime = os.path.getmtime(session_path)
+    if not overwrite and all(os.path.exists(p) and os.path.getmtime(p) >= mtime for p in paths):
+        return 0
+    for p in paths:
+        if os.path.exists(p):
+            os.remove(p)
+    session = load_session(session_path)
+    if not len(session):
+        return 0
+    writer = TileWriter(session_path, session_origin(session), levels, {"channel": session.metadata.get("channel")})
+    for start in range(0, len(session), BACKFILL_CHUNK):
+        writer.append(session.times[start:start + BACKFILL_CHUNK], session.values[start:start + BACKFILL_CHUNK])
+    writer.close()
+    return len(session)
+
+def build_tree(data_dir="data", overwrite=False):
+    """Backfill tiles for every session under ``data_dir``; a .chs is preferred over its CSV twin."""
+    built = []
+    for path in find_sessions(data_dir):
+        try:
+            count = build_tiles(path, overwrite=overwrite)
+        except ValueError as e:
+            print(f"[ERROR] {path}: {e}")
+            continue
+        if count:
+            built.append(path)
+            print(f"[SUCCESS] {path}: {count} samples tiled")
+    return built
+
+class TileStore:
+    """Read side of the pyramid for every session under ``data_dir``.
+
+    ``query`` picks the coarsest level that still gives about ``max_points``
+    buckets for the requested range. It memory-maps only the tile files of the
+    sessions that overlap the range, slices them with a binary search, and
+    merges buckets that several sessions share. Below the finest level, the raw
+    .chs samples are returned when few enough fall in the range.
+    """
+
+    def __init__(self, data_dir="data", levels=LEVELS):
+        self.data_dir = data_dir
+        self.levels = levels
+        self.sessions = {}   # stem -> (first, last, origin, channel, file signature); channel "" when unnamed
+        self.refresh()
+
+    def refresh(self):
+        coarsest = f".{self.levels[-1]}s{TILE_EXTENSION}"
+        found = {}
+        for root, _, files in os.walk(self.data_dir):
+            for name in files:
+                if not name.endswith(coarsest):
+                    continue
+                path = os.path.join(root, name)
+                stem = path[:-len(coarsest)]
+                finest = tile_path(stem, self.levels[0])
+                if not os.path.exists(finest):
+                    continue
+                st = os.stat(finest)
+                signature = (st.st_mtime_ns, st.st_size)
+                cached = self.sessions.get(stem)
+                if cached and cached[4] == signature:
+                    found[stem] = cached
+                    continue
+                metadata, tiles = load_tiles(finest)
+                if len(tiles):
+                    found[stem] = (float(tiles["time"][0]), float(tiles["time"][-1]) + self.levels[0],
+                                   metadata.get("origin", 0.0), metadata.get("channel") or "", signature)
+        self.sessions = found
+
+    def channels(self):
+        """Channel names of the tiled sessions, sorted; "" stands for sessions recorded without one."""
+        return sorted({s[3] for s in self.sessions.values()})
+
+    def span(self, channel=None):
+        """(first, last) epoch seconds covered by any session of ``channel`` (default: all), or None."""
+        sessions = [s for s in self.sessions.values() if channel is None or s[3] == channel]
+        if not sessions:
+            return None
+        return min(s[0] for s in sessions), max(s[1] for s in sessions)
+
+    def overlapping(self, t0, t1, channel=None):
+        return sorted((s[0], stem) for stem, s in self.sessions.items()
+                      if s[0] <= t1 and s[1] >= t0 and (channel is None or s[3] == channel))
+
+    def query(self, t0, t1, max_points=2000, channel=None):
+        """(level, times, mins, maxs, means) for [t0, t1]; level 0 means raw samples.
+
+        Gaps longer than two buckets are separated by NaN, so a curve drawn with
+        connect="finite" does not bridge them.
+        """
+        sessions = self.overlapping(t0, t1, channel)
+        span = max(t1 - t0, 1e-9)
+        level = next((lv for lv in self.levels if span / lv <= max_points), self.levels[-1])
+        if level == self.levels[0]:
+            raw = self.query_raw(sessions, t0, t1, 4 * max_points)
+            if raw is not None:
+                return (0,) + raw
+        parts = []
+        for _, stem in sessions:
+            _, tiles = load_tiles(tile_path(stem, level))
+            i, j = np.searchsorted(tiles["time"], [t0 - level, t1], side="right")
+            parts.append(np.array(tiles[max(i - 1, 0):j]))
+        tiles = np.concatenate(parts) if parts else np.empty(0, dtype=TILE)
+        if len(sessions) > 1 and len(tiles):
+            tiles = merge(tiles)
+        return (level,) + with_gaps(tiles["time"], tiles["min"], tiles["max"], tiles["mean"], 2 * level)
+
+    def query_raw(self, sessions, t0, t1, limit):
+        times, values = [], []
+        for _, stem in sessions:
+            path = stem + EXTENSION
+            if not os.path.exists(path):
+                return None
+            session = load_session(path)
+            origin = self.sessions[stem][2]
+            i, j = np.searchsorted(session.times, [t0 - origin, t1 - origin])
+            if sum(len(v) for v in values) + (j - i) > limit:
+                return None
+            times.append(origin + np.asarray(session.times[i:j]))
+            values.append(np.asarray(session.values[i:j]))
+        if not times:
+            return None
+        t, v = np.concatenate(times), np.concatenate(values)
+        order = np.argsort(t, kind="stable")
+        t, v = t[order], v[order]
+        step = np.median(np.diff(t)) if len(t) > 1 else 1.0
+        return with_gaps(t, v, v, v, max(10 * step, self.levels[0]))
+
+def merge(tiles):
+    """Combine buckets with the same start time, as happens when sessions overlap."""
+    tiles = np.sort(tiles, order="time", kind="stable")
+    starts = np.flatnonzero(np.diff(tiles["time"], prepend=np.nan))
+    if len(starts) == len(tiles):
+        return tiles
+    counts = np.add.reduceat(tiles["count"].astype(np.float64), starts)
+    merged = np.empty(len(starts), dtype=TILE)
+    merged["time"] = tiles["time"][starts]
+    merged["min"] = np.minimum.reduceat(tiles["min"], starts)
+    merged["max"] = np.maximum.reduceat(tiles["max"], starts)
+    merged["mean"] = np.add.reduceat(tiles["mean"] * tiles["count"], starts) / counts
+    merged["count"] = counts
+    return merged
+
+def with_gaps(times, mins, maxs, means, max_gap):
+    """Insert a NaN row wherever consecutive times are more than ``max_gap`` apart."""
+    gaps = np.flatnonzero(np.diff(times) > max_gap) + 1
+    if not len(gaps):
+        return np.asarray(times), np.asarray(mins), np.asarray(maxs), np.asarray(means)
+    return (np.insert(times, gaps, times[gaps - 1] + max_gap / 2), np.insert(mins, gaps, np.nan),
+            np.insert(maxs, gaps, np.nan), np.insert(means, gaps, np.nan))
+
+if __name__ == "__main__":
+    build_tree(sys.argv[1] if len(sys.argv) > 1 else "data")
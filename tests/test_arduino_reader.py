@@ -0,0 +1,62 @@
+import time
+import threading
+import numpy as np
+from sensors.arduino_reader import ArduinoReader, CONNECTED
+
+class ScriptedSerial:
+    """serial.Serial stand-in that returns a fixed list of chunks, split wherever the test likes."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.is_open = True
+        self.drained = threading.Event()
+
+    def factory(self, port, baudrate, timeout=None):
+        self.timeout = timeout
+        return self
+
+    def reset_input_buffer(self):
+        pass
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size=1):
+        if not self.chunks:
+            self.drained.set()
+            time.sleep(self.timeout)
+            return b""
+        return self.chunks.pop(0)
+
+    def close(self):
+        self.is_open = False
+
+def test_partial_line_is_carried_over_with_the_completing_chunk_timestamp():
+    reader = ArduinoReader(serial_factory=ScriptedSerial([]).factory)
+    reader.handle_chunk(b"20.10\n20", 1.0)
+    reader.handle_chunk(b".5", 2.0)
+    reader.handle_chunk(b"0\n21.00\n2", 3.0)
+    timestamps, values, _ = reader.buffer.read_since(0)
+    assert values.tolist() == [20.1, 20.5, 21.0]
+    # a sample is stamped when its line is completed, not when it started
+    assert timestamps.tolist() == [1.0, 3.0, 3.0]
+    assert bytes(reader.parser.pending) == b"2"
+    assert reader.parser.malformed == 0
+
+def test_fake_port_split_mid_line_through_the_read_thread():
+    port = ScriptedSerial([b"25.0", b"0\n25.", b"10\n25.20\n", b"bad\n25.30\n"])
+    reader = ArduinoReader(serial_factory=port.factory, read_timeout=0.01)
+    began = time.monotonic()
+    reader.start_reading()
+    try:
+        assert port.drained.wait(2.0)
+        assert reader.state == CONNECTED
+    finally:
+        reader.stop_reading()
+        reader.thread.join()
+    timestamps, values, _ = reader.buffer.read_since(0)
+    assert values.tolist() == [25.0, 25.1, 25.2, 25.3]
+    assert reader.parser.malformed == 1
+    assert np.all(np.diff(timestamps) >= 0)
+    assert began <= timestamps[0] and timestamps[-1] <= time.monotonic()
@@ -0,0 +1,34 @@
+import os
+import numpy as np
+from sensors.simulated import profile_temperature
+from storage.session_file import write_session
+from storage.catalog import SessionCatalog
+from algorithms.batch_analysis import run_batch
+
+def write_day(data_dir, count=2):
+    folder = os.path.join(data_dir, "2026-01-05")
+    os.makedirs(folder)
+    t = np.arange(0.0, 3500.0, 1.0)
+    for n in range(count):
+        write_session(os.path.join(folder, f"temperature_0{n}-00-00.chs"), t, profile_temperature(t),
+                      {"started": f"2026-01-05T0{n}:00:00"})
+
+def test_full_import_analyses_sessions_a_quick_import_added(tmp_path):
+    data = str(tmp_path / "data")
+    write_day(data)
+    catalog = SessionCatalog(str(tmp_path / "catalog.sqlite"))
+    assert catalog.import_tree(data, str(tmp_path / "results"), analyze=False) == (2, 0)
+    assert all(row["analyzed"] is None for row in catalog.sessions())
+    assert catalog.import_tree(data, str(tmp_path / "results")) == (2, 0)
+    assert all(row["temper_index"] is not None for row in catalog.sessions())
+    assert catalog.import_tree(data, str(tmp_path / "results")) == (0, 0)
+
+def test_cached_batch_run_fills_a_new_catalog(tmp_path):
+    data, results = str(tmp_path / "data"), str(tmp_path / "results")
+    write_day(data)
+    run_batch(data, results, workers=1, fmt="json")
+    catalog = SessionCatalog(str(tmp_path / "catalog.sqlite"))
+    run_batch(data, results, workers=1, fmt="json", catalog=catalog)
+    rows = catalog.sessions()
+    assert len(rows) == 2
+    assert all(row["temper_index"] is not None and row["report"] for row in rows)
@@ -0,0 +1,80 @@
+import numpy as np
+from sensors.line_parser import TextLineParser, BinaryFrameParser, encode_frames
+from sensors.sample_buffer import SampleBuffer
+
+def feed(parser, chunk, columns):
+    buffers = [SampleBuffer(64) for _ in range(columns)]
+    parser.feed(chunk, 1.0, buffers)
+    return [buffer.read_since(0)[1].tolist() for buffer in buffers]
+
+def test_well_formed_lines_take_the_bulk_path():
+    parser = TextLineParser(columns=2)
+    assert feed(parser, b"1.5,2\n3,4\n", 2) == [[1.5, 3.0], [2.0, 4.0]]
+    assert parser.malformed == 0
+
+def test_ragged_lines_are_not_resliced_across_channels():
+    parser = TextLineParser(columns=3)
+    # six tokens over two lines divide evenly by three, but neither line has three fields
+    assert feed(parser, b"1,2\n3,4,5,6\n", 3) == [[], [], []]
+    assert parser.malformed == 2
+
+def test_ragged_lines_keep_the_good_ones():
+    parser = TextLineParser(columns=2)
+    assert feed(parser, b"1,2\n3\n4,5,6\n7,8\n", 2) == [[1.0, 7.0], [2.0, 8.0]]
+    assert parser.malformed == 2
+
+def test_single_column_line_with_two_tokens_is_malformed():
+    parser = TextLineParser(columns=1)
+    assert feed(parser, b"25.1 25.2\n26.0\n", 1) == [[26.0]]
+    assert parser.malformed == 1
+
+def test_blank_lines_are_skipped_without_counting():
+    parser = TextLineParser(columns=1)
+    assert feed(parser, b"20\n\r\n21\n", 1) == [[20.0, 21.0]]
+    assert parser.malformed == 0
+
+def test_partial_line_is_carried_into_the_next_chunk():
+    parser = TextLineParser(columns=1)
+    buffer = SampleBuffer(64)
+    assert parser.feed(b"20.1\n20", 1.0, [buffer]) == 1
+    assert parser.feed(b".2\n", 2.0, [buffer]) == 1
+    timestamps, values, _ = buffer.read_since(0)
+    assert np.array_equal(values, [20.1, 20.2])
+    assert np.array_equal(timestamps, [1.0, 2.0])
+
+def feed_chunks(parser, chunks):
+    buffer = SampleBuffer(64)
+    for chunk in chunks:
+        parser.feed(chunk, 1.0, [buffer])
+    return buffer.read_since(0)[1].tolist()
+
+def test_frame_torn_across_reads_is_completed_by_the_next_read():
+    parser = BinaryFrameParser()
+    data = encode_frames([21.5, 22.25, -3.0])
+    assert feed_chunks(parser, [data[:7], data[7:12], data[12:]]) == [21.5, 22.25, -3.0]
+    assert (parser.malformed, parser.lost, len(parser.pending)) == (0, 0, 0)
+
+def test_bad_checksum_drops_only_that_frame():
+    parser = BinaryFrameParser()
+    data = bytearray(encode_frames([21.0, 22.0, 23.0]))
+    data[9] ^= 0x01  # checksum of the second frame
+    assert feed_chunks(parser, [bytes(data)]) == [21.0, 23.0]
+    assert parser.malformed == 1
+    # the rejected frame leaves a hole in the sequence
+    assert parser.lost == 1
+
+def test_resync_after_garbage():
+    parser = BinaryFrameParser()
+    garbage = b"\x00\x13\xa5\x01\x02noise\r\n"
+    data = encode_frames([30.0, 31.0])
+    assert feed_chunks(parser, [garbage + data[:3], data[3:]]) == [30.0, 31.0]
+    assert parser.malformed >= 1
+    assert parser.lost == 0
+
+def test_sequence_jumps_count_lost_frames_across_reads_and_wraparound():
+    parser = BinaryFrameParser()
+    chunks = [encode_frames([20.0, 20.1], start_seq=254), encode_frames([20.2], start_seq=0),
+              encode_frames([20.3, 20.4], start_seq=4)]
+    assert feed_chunks(parser, chunks) == [20.0, 20.1, 20.2, 20.3, 20.4]
+    assert parser.lost == 3
+    assert parser.malformed == 0
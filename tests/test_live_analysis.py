@@ -0,0 +1,34 @@
+import numpy as np
+from algorithms.live_analysis import LiveAnalyzer, ewma
+
+def feed_chunks(analyzer, times, values, chunk=10):
+    events = []
+    for start in range(0, len(times), chunk):
+        events += analyzer.feed(times[start:start + chunk], values[start:start + chunk])
+    return events
+
+def test_ewma_with_full_decay_follows_the_input():
+    values = np.array([1.0, 2.0, 3.0])
+    assert np.array_equal(ewma(values, 1.0, 10.0), values)
+    assert np.isfinite(ewma(values, 1.0 - 1e-300, 10.0)).all()
+
+def test_ewma_matches_the_recurrence():
+    rng = np.random.default_rng(0)
+    values, alpha, level = rng.normal(size=500), 0.05, 3.0
+    expected = []
+    for x in values:
+        level = level + alpha * (x - level)
+        expected.append(level)
+    assert np.allclose(ewma(values, alpha, 3.0), expected)
+
+def test_long_gap_does_not_poison_the_level():
+    analyzer = LiveAnalyzer()
+    t = np.arange(0.0, 120.0, 0.1)
+    feed_chunks(analyzer, t, 20.0 + t * 0.1)
+    # 3900 s without samples, then the batch keeps heating
+    later = t[-1] + 3900.0 + np.arange(0.0, 120.0, 0.1)
+    feed_chunks(analyzer, later, 40.0 + (later - later[0]) * 0.1)
+    assert np.isfinite(analyzer.level) and np.isfinite(analyzer.slope)
+    assert abs(analyzer.level - 52.0) < 1.0
+    assert analyzer.slope > 1.0
+    assert analyzer.phase is not None and analyzer.phase.name == "melt"
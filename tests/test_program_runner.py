@@ -0,0 +1,48 @@
+import time
+import numpy as np
+from control.program_runner import ProgramRunner, ProgramStep, ARMED, HOLDING, IDLE
+from sensors.sample_buffer import SampleBuffer
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def rearming_runner(buffer, program):
+    runner = ProgramRunner(buffer, program, poll_interval=0.005)
+    events = []
+
+    def listener(event, step):
+        events.append(event)
+        if event in ("finished", "aborted"):
+            runner.arm()
+    runner.add_listener(listener)
+    return runner, events
+
+def test_rearmed_runner_starts_again_only_after_leaving_the_start_temperature():
+    buffer = SampleBuffer(1024)
+    runner, events = rearming_runner(buffer, [ProgramStep(30.0, 0.05)])
+    runner.arm()
+    buffer.extend(time.monotonic(), np.array([20.0, 25.0, 30.2]))
+    assert wait_for(lambda: events.count("finished") == 1)
+    assert wait_for(lambda: runner.state == ARMED)
+    # noise around the start temperature right after the run must not start another one
+    buffer.extend(time.monotonic(), np.array([29.8, 30.1, 29.9]))
+    time.sleep(0.05)
+    assert events.count("started") == 1
+    buffer.extend(time.monotonic(), np.array([27.0, 28.5, 30.0]))
+    assert wait_for(lambda: events.count("finished") == 2)
+    runner.abort()
+
+def test_program_applied_during_a_run_is_armed_after_it():
+    buffer = SampleBuffer(1024)
+    runner, events = rearming_runner(buffer, [ProgramStep(30.0, 10.0)])
+    runner.start_now()
+    assert runner.state == HOLDING
+    runner.set_program([ProgramStep(45.0, 1.0)])
+    runner.abort()
+    assert runner.state == ARMED
+    assert runner.program[0].temperature == 45.0
+    runner.set_program([])
+    assert runner.state == IDLE
@@ -0,0 +1,39 @@
+import os
+import datetime
+import numpy as np
+import pytest
+from sensors.simulated import profile_temperature
+from storage.session_file import write_session
+from algorithms.session_comparison import compare_sessions, control_limits
+
+SHIFTED = 14
+
+@pytest.fixture(scope="module")
+def sessions(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("sessions")
+    rng = np.random.default_rng(7)
+    base = datetime.datetime(2026, 1, 1, 8)
+    paths = []
+    for n in range(20):
+        started = base + datetime.timedelta(hours=6 * n)
+        t = np.arange(0.0, 3500.0, 0.5)
+        v = profile_temperature(t) + rng.normal(0, 0.05, len(t)) + rng.normal(0, 0.1)
+        if n == SHIFTED:
+            v += 3.0
+        path = os.path.join(folder, f"temperature_{started:%H-%M-%S}_{n}.chs")
+        write_session(path, t, v, {"started": started.isoformat(timespec="seconds")})
+        paths.append(path)
+    return paths
+
+@pytest.mark.parametrize("align", ["time", "phase"])
+def test_one_shifted_session_is_the_only_one_flagged(sessions, align):
+    comparison = compare_sessions(sessions, align=align)
+    assert comparison.out_of_control == [SHIFTED]
+    center, _ = comparison.limits["bias"]
+    assert abs(center) < 0.1
+
+def test_control_limits_drop_points_beyond_three_sigma():
+    values = np.array([0.1, -0.1] * 10 + [5.0])
+    center, sigma = control_limits(values)
+    assert center == pytest.approx(0.0)
+    assert sigma == pytest.approx(0.2 / 1.128)
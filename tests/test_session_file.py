@@ -0,0 +1,14 @@
+import os
+from storage.session_file import find_sessions, write_session
+
+def test_find_sessions_prefers_the_binary_twin_and_skips_empty_files(tmp_path):
+    day = tmp_path / "2026-01-05"
+    day.mkdir()
+    write_session(str(day / "temperature_08-00-00.chs"), [0.0, 1.0], [20.0, 21.0])
+    (day / "temperature_08-00-00.csv").write_text("Time (s),Temperature (°C)\n0.000,20.00\n")
+    (day / "temperature_09-00-00.csv").write_text("Time (s),Temperature (°C)\n0.000,20.00\n")
+    (day / "temperature_10-00-00.chs").touch()
+    (day / "temperature_10-00-00.csv").write_text("Time (s),Temperature (°C)\n0.000,20.00\n")
+    (day / "notes.txt").write_text("")
+    assert [os.path.basename(p) for p in find_sessions(str(tmp_path))] == [
+        "temperature_08-00-00.chs", "temperature_09-00-00.csv", "temperature_10-00-00.csv"]
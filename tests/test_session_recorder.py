@@ -0,0 +1,66 @@
+import os
+import time
+import numpy as np
+from sensors.sample_buffer import SampleBuffer
+from storage.session_file import binary_path, load_session
+from storage.session_recorder import SessionRecorder
+
+def test_recording_without_samples_leaves_no_files(tmp_path):
+    recorder = SessionRecorder(SampleBuffer(64), str(tmp_path), flush_interval=0.01)
+    path = recorder.start()
+    recorder.stop(wait=True)
+    assert not os.path.exists(path)
+    assert not os.path.exists(binary_path(path))
+    assert not any(files for _, _, files in os.walk(tmp_path))
+
+def test_restart_in_the_same_second_gets_its_own_files(tmp_path):
+    buffer = SampleBuffer(64)
+    recorder = SessionRecorder(buffer, str(tmp_path), flush_interval=0.01)
+    paths = []
+    for value in (20.0, 30.0):
+        paths.append(recorder.start())
+        buffer.extend(time.monotonic(), np.array([value, value]))
+        recorder.stop(wait=True)
+    assert paths[0] != paths[1]
+    for path, value in zip(paths, (20.0, 30.0)):
+        session = load_session(binary_path(path))
+        assert session.values.tolist() == [value, value]
+
+class SlowCatalog:
+    def __init__(self):
+        self.paths = []
+
+    def add_session(self, path, **kwargs):
+        time.sleep(0.3)
+        self.paths.append(path)
+
+def test_start_while_the_last_session_drains_opens_a_new_one(tmp_path):
+    buffer = SampleBuffer(64)
+    catalog = SlowCatalog()
+    recorder = SessionRecorder(buffer, str(tmp_path), flush_interval=0.01, catalog=catalog)
+    first = recorder.start()
+    buffer.extend(time.monotonic(), np.array([20.0]))
+    recorder.stop()
+    assert not recorder.is_recording()
+    second = recorder.start()
+    assert second != first
+    assert recorder.is_recording()
+    buffer.extend(time.monotonic(), np.array([30.0]))
+    recorder.stop(wait=True)
+    assert catalog.paths == [first, second]
+    assert load_session(binary_path(second)).values.tolist() == [30.0]
+
+def test_analyze_recording_catalogs_the_finished_session(tmp_path, monkeypatch):
+    from storage.catalog import SessionCatalog
+    from storage.session_recorder import analyze_recording
+    monkeypatch.chdir(tmp_path)
+    buffer = SampleBuffer(4096)
+    catalog = SessionCatalog(str(tmp_path / "catalog.sqlite"))
+    recorder = SessionRecorder(buffer, "data", flush_interval=0.01, catalog=catalog)
+    path = recorder.start()
+    buffer.extend(time.monotonic() + np.arange(600.0), 30.0 + np.sin(np.arange(600.0) / 50.0))
+    thread = recorder.thread
+    recorder.stop()
+    analyze_recording(path, thread, catalog)
+    [row] = catalog.sessions()
+    assert row["analyzed"] is not None and os.path.exists(row["report"])
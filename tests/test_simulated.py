@@ -0,0 +1,16 @@
+import time
+from sensors.simulated import SyntheticSource
+
+def test_restarted_synthetic_source_produces_samples_again():
+    source = SyntheticSource(rate_hz=1000.0, batch_interval=0.002, seed=1)
+    source.start_reading()
+    time.sleep(0.2)
+    source.stop_reading()
+    source.thread.join()
+    written = source.buffer.written
+    assert written > 0
+    source.start_reading()
+    time.sleep(0.1)
+    source.stop_reading()
+    source.thread.join()
+    assert source.buffer.written - written > 50
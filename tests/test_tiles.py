@@ -0,0 +1,20 @@
+import numpy as np
+from storage.tiles import TileWriter, TileStore
+
+def write_tiles(path, channel, value, origin=1_700_000_000.0):
+    writer = TileWriter(str(path), origin, metadata={"channel": channel} if channel else None)
+    elapsed = np.arange(0.0, 3600.0, 0.5)
+    writer.append(elapsed, np.full(len(elapsed), value))
+    writer.close()
+
+def test_query_keeps_channels_apart(tmp_path):
+    for channel, value in (("T1", 20.0), ("T2", 40.0), (None, 30.0)):
+        write_tiles(tmp_path / f"{channel or 'old'}_temperature_08-00-00.csv", channel, value)
+    store = TileStore(str(tmp_path))
+    assert store.channels() == ["", "T1", "T2"]
+    t0, t1 = store.span("T1")
+    for channel, value in (("T1", 20.0), ("T2", 40.0), ("", 30.0)):
+        _, _, mins, maxs, means = store.query(t0, t1, 500, channel)
+        assert np.nanmin(mins) == np.nanmax(maxs) == value
+    _, _, mins, maxs, _ = store.query(t0, t1, 500)
+    assert (np.nanmin(mins), np.nanmax(maxs)) == (20.0, 40.0)
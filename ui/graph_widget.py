@@ -1,23 +1,51 @@
 import pyqtgraph as pg
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
-from PyQt6.QtCore import QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 import datetime
+import logging
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+import time
+from concurrent.futures import ThreadPoolExecutor
+from algorithms.live_analysis import LiveAnalyzer
+from ui.plot_series import DecimatedSeries
+from monitoring.metrics import REGISTRY, RateTracker, PLOT_LATENCY, PLOT_DURATION, PARSE_ERRORS, RECORDER_FLUSH
+
+log = logging.getLogger(__name__)
+
+# ألوان خطوط المراحل على الرسم
+PHASE_COLORS = {"melt": "#FF8C00", "cool": "#1E90FF", "rework": "#FF69B4", "hold": "#AAAAAA"}
+MAX_ALERTS = 50
 
 class GraphWidget(QWidget):
     process_completed = pyqtSignal()
+    live_event = pyqtSignal(object)   # LiveEvent from the streaming analysis
 
-    def __init__(self, arduino_reader):
+    def __init__(self, arduino_reader, refresh_ms=100, window_seconds=None, report_format="png", report_dpi=100,
+                 catalog=None):
         super().__init__()
         self.arduino_reader = arduino_reader
+        self.catalog = catalog
+        self.refresh_ms = refresh_ms
+        # window_seconds: عرض آخر N ثانية فقط (نافذة متحركة)، None لعرض كامل التشغيل
+        self.window_seconds = window_seconds
+        self.series = DecimatedSeries()
+        self.analyzer = LiveAnalyzer()
+        self.alerts = []
+        self.annotations = []
+        # الحفظ يتم في خيط منفصل حتى لا تتجمد الواجهة عند الضغط على Stop
+        self.report_format = report_format
+        self.report_dpi = report_dpi
+        self.renderer = None
+        self.save_executor = ThreadPoolExecutor(max_workers=1)
         self.init_ui()
-        self.data_points = []
         self.running = False
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_plot)
-        self.time_stamps = []
+        buffer = self.arduino_reader.buffer
+        REGISTRY.gauge("buffer_fill_ratio", "Share of the sample ring in use", lambda: len(buffer) / buffer.capacity)
+        self.rate_tracker = RateTracker(REGISTRY)
+        self.overlay_timer = QTimer()
+        self.overlay_timer.timeout.connect(self.update_metrics_overlay)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -26,51 +54,170 @@ class GraphWidget(QWidget):
         self.graph.setTitle("Temperature vs Time", color="w", size="18pt")
         self.graph.setLabel("left", "Temperature (°C)", color="white", size="14pt")
         self.graph.setLabel("bottom", "Time (s)", color="white", size="14pt")
-        self.curve = self.graph.plot(pen=pg.mkPen(color="c", width=2))
+        # connect="finite": NaN gap markers from a reconnect break the line
+        self.curve = self.graph.plot(pen=pg.mkPen(color="c", width=2), connect="finite")
+        self.break_markers = pg.ScatterPlotItem(size=10, symbol="x", pen=pg.mkPen("r", width=2), brush=None)
+        self.graph.addItem(self.break_markers)
+        self.graph.getViewBox().sigXRangeChanged.connect(self.on_range_changed)
+        # حالة التحليل الحي: المرحلة الحالية والميل والمؤشر
+        self.analysis_label = QLabel()
+        self.analysis_label.setStyleSheet("color: white; font-size: 14px; padding: 2px;")
+        layout.addWidget(self.analysis_label)
         layout.addWidget(self.graph)
         self.setLayout(layout)
 
-    def start_graph(self):
+        # لوحة المقاييس فوق الرسم (F3 لإظهارها/إخفائها)
+        self.metrics_overlay = QLabel(self.graph)
+        self.metrics_overlay.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: #00FF00; "
+                                           "font-family: monospace; font-size: 11px; padding: 6px;")
+        self.metrics_overlay.move(70, 40)
+        self.metrics_overlay.hide()
+
+    def start_graph(self, since=None):
+        """Plot from now on, or from the monotonic time ``since`` with what the buffer still holds."""
         if not self.running:
-            self.data_points = []
-            self.time_stamps = []
+            self.series.clear()
+            self.analyzer.reset()
+            self.clear_annotations()
             self.running = True
-            self.start_time = datetime.datetime.now()
-            self.timer.start(1000)
-            print("✅ Graph started")
+            buffer = self.arduino_reader.buffer
+            if since is None:
+                self.start_time = time.monotonic()
+                self.cursor = buffer.cursor()
+            else:
+                self.start_time = since
+                self.cursor = buffer.cursor_since(since)
+            self.timer.start(self.refresh_ms)
+            log.info("✅ Graph started")
 
     def stop_graph(self):
         if self.running:
             self.running = False
             self.timer.stop()
-            print("🛑 Graph stopped")
+            log.info("🛑 Graph stopped")
+            if self.analyzer.samples:
+                log.info("📊 Live analysis: %s", self.analyzer.summary())
             self.save_results()
             self.process_completed.emit()
 
     def update_plot(self):
-        temperature = self.arduino_reader.get_latest_temperature()
-        if temperature is not None:
-            elapsed_time = (datetime.datetime.now() - self.start_time).total_seconds()
-            self.data_points.append(temperature)
-            self.time_stamps.append(elapsed_time)
-            self.curve.setData(self.time_stamps, self.data_points)
+        began = time.perf_counter()
+        timestamps, values, self.cursor = self.arduino_reader.buffer.read_since(self.cursor)
+        if len(values):
+            x = timestamps - self.start_time
+            self.series.append(x, values)
+            for event in self.analyzer.feed(x, values):
+                self.annotate(event)
+            self.update_analysis_label()
+            self.redraw()
+            PLOT_LATENCY.observe((time.monotonic() - timestamps[-1]) * 1000.0)
+        PLOT_DURATION.observe((time.perf_counter() - began) * 1000.0)
+
+    def annotate(self, event):
+        if event.kind == "phase":
+            line = pg.InfiniteLine(pos=event.time, angle=90, movable=False,
+                                   pen=pg.mkPen(PHASE_COLORS.get(event.phase, "w"), width=1,
+                                                style=Qt.PenStyle.DashLine),
+                                   label=event.phase, labelOpts={"position": 0.95, "color": "w"})
+            self.graph.addItem(line)
+            self.annotations.append(line)
+        elif event.kind == "break":
+            self.break_markers.addPoints([event.time], [event.temp])
+        if event.alert:
+            self.alerts = (self.alerts + [event])[-MAX_ALERTS:]
+            log.warning("⚠ %s at %.1f s", event.message, event.time)
+        self.live_event.emit(event)
+
+    def clear_annotations(self):
+        for item in self.annotations:
+            self.graph.removeItem(item)
+        self.annotations = []
+        self.alerts = []
+        self.break_markers.clear()
+        self.analysis_label.clear()
+
+    def update_analysis_label(self):
+        analyzer = self.analyzer
+        phase = analyzer.phase.name.capitalize() if analyzer.phase else "…"
+        text = (f"Phase: {phase}   Slope: {analyzer.slope:+.2f} °C/min   "
+                f"Mean: {analyzer.mean_temp:.2f} °C   Temper Index: {analyzer.temper_index}/10")
+        if self.alerts:
+            text += f"   ⚠ {self.alerts[-1].message}"
+        self.analysis_label.setText(text)
+
+    def toggle_metrics_overlay(self):
+        if self.metrics_overlay.isVisible():
+            self.overlay_timer.stop()
+            self.metrics_overlay.hide()
+        else:
+            self.update_metrics_overlay()
+            self.metrics_overlay.show()
+            self.overlay_timer.start(1000)
+
+    def update_metrics_overlay(self):
+        rates = self.rate_tracker.rates()
+        buffer = self.arduino_reader.buffer
+        self.metrics_overlay.setText(
+            f"serial      {rates.get('serial_lines_total', 0):8.0f} lines/s {rates.get('serial_bytes_total', 0) / 1024:7.1f} KiB/s\n"
+            f"parse errs  {PARSE_ERRORS.value:8d}\n"
+            f"buffer      {100.0 * len(buffer) / buffer.capacity:7.1f} %\n"
+            f"latency     p50 {PLOT_LATENCY.quantile(0.5):g} ms  p99 {PLOT_LATENCY.quantile(0.99):g} ms\n"
+            f"update_plot p99 {PLOT_DURATION.quantile(0.99):g} ms\n"
+            f"flush       p99 {RECORDER_FLUSH.quantile(0.99):g} ms")
+        self.metrics_overlay.adjustSize()
+
+    def redraw(self):
+        """Push only what is visible, decimated to about two points per pixel."""
+        if not len(self.series):
+            return
+        view_box = self.graph.getViewBox()
+        max_points = 2 * max(self.graph.width(), 100)
+        if not view_box.autoRangeEnabled()[0]:
+            # the user zoomed or panned: draw the range they are looking at
+            x_min, x_max = view_box.viewRange()[0]
+        elif self.window_seconds:
+            x_max = self.series.x[len(self.series) - 1]
+            x_min = x_max - self.window_seconds
+        else:
+            x_min = x_max = None
+        x, y = self.series.view(x_min, x_max, max_points)
+        self.curve.setData(x, y)
+
+    def on_range_changed(self, *_):
+        if not self.graph.getViewBox().autoRangeEnabled()[0]:
+            self.redraw()
 
     def save_results(self):
-        if not self.data_points:
-            print("⚠ No data to save")
+        if not len(self.series):
+            log.warning("⚠ No data to save")
             return
 
         folder = "results"
         os.makedirs(folder, exist_ok=True)
         file_name = os.path.join(folder, f"graph_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png")
+        # min/max decimated copy: identical at report resolution and safe from the next run's clear()
+        x, y = self.series.view(max_points=4000)
+        return self.save_executor.submit(self.write_report, x.copy(), y.copy(), file_name)
+
+    def report_renderer(self):
+        # matplotlib يُحمّل عند أول تقرير أو في التسخين المسبق، وليس عند فتح النافذة.
+        # only ever called on the single save thread, so no lock is needed
+        if self.renderer is None:
+            from algorithms.report_renderer import ReportRenderer
+            self.renderer = ReportRenderer(self.report_format, self.report_dpi)
+        return self.renderer
+
+    def prewarm(self):
+        """Load matplotlib and build the graph template on the save thread, in the background."""
+        return self.save_executor.submit(lambda: self.report_renderer().warm_up("graph"))
 
-        plt.figure()
-        plt.plot(self.time_stamps, self.data_points, label="Temperature", color='blue')
-        plt.xlabel("Time (s)")
-        plt.ylabel("Temperature (°C)")
-        plt.title("Temperature Graph")
-        plt.legend()
-        plt.grid()
-        plt.savefig(file_name, bbox_inches='tight', dpi=300)
-        plt.close()
-        print(f"📷 Graph saved at {file_name}")
+    def write_report(self, x, y, file_name):
+        try:
+            file_name = self.report_renderer().render_graph(x, y, file_name)
+        except Exception as e:
+            log.error("❌ Could not save graph: %s", e)
+            return None
+        log.info("📷 Graph saved at %s", file_name)
+        if self.catalog is not None:
+            self.catalog.add_report(file_name)
+        return file_name
@@ -0,0 +1,115 @@
+import sys
+import time
+import pyqtgraph as pg
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+from PyQt6.QtCore import QTimer
+from storage.tiles import TileStore
+
+LEVEL_NAMES = {0: "raw samples", 1: "1 s", 10: "10 s", 60: "1 min", 600: "10 min"}
+
+class HistoryViewer(QWidget):
+    """Pan and zoom across every recorded session.
+
+    Each range change fetches only the tiles for the visible span, at about one
+    bucket per pixel, from storage.tiles.TileStore. The min/max envelope is
+    shaded and the mean is drawn on top of it. Fetches are debounced so a drag
+    triggers one query per frame, not one per mouse event.
+
+    One channel is shown at a time (``channel``, default the first), so sensors
+    recorded side by side are never merged into one trace.
+    """
+
+    def __init__(self, data_dir="data", refresh_ms=5000, channel=None):
+        super().__init__()
+        self.setWindowTitle("📈 Temperature History")
+        self.setGeometry(120, 120, 1280, 640)
+        self.setStyleSheet("background-color: #121212; color: white;")
+        self.store = TileStore(data_dir)
+        self.channel = channel
+
+        layout = QVBoxLayout()
+        self.channel_bar = QHBoxLayout()
+        self.channel_bar.addWidget(QLabel("Channel:"))
+        self.channel_box = QComboBox()
+        self.channel_box.currentIndexChanged.connect(self.select_channel)
+        self.channel_bar.addWidget(self.channel_box)
+        self.channel_bar.addStretch()
+        layout.addLayout(self.channel_bar)
+        self.graph = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem()})
+        self.graph.setBackground("#1A1A1A")
+        self.graph.setLabel("left", "Temperature (°C)", color="white", size="14pt")
+        self.graph.showGrid(x=True, y=True, alpha=0.2)
+        self.graph.getViewBox().setAutoVisible(y=True)
+        self.min_curve = self.graph.plot(pen=pg.mkPen("#1E90FF", width=1), connect="finite")
+        self.max_curve = self.graph.plot(pen=pg.mkPen("#1E90FF", width=1), connect="finite")
+        self.envelope = pg.FillBetweenItem(self.min_curve, self.max_curve, brush=pg.mkBrush(30, 144, 255, 70))
+        self.graph.addItem(self.envelope)
+        self.mean_curve = self.graph.plot(pen=pg.mkPen("c", width=2), connect="finite")
+        self.graph.getViewBox().sigXRangeChanged.connect(self.schedule_fetch)
+        layout.addWidget(self.graph)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #AAAAAA; font-size: 12px;")
+        layout.addWidget(self.status_label)
+        self.setLayout(layout)
+
+        self.fetch_timer = QTimer(singleShot=True)
+        self.fetch_timer.timeout.connect(self.fetch)
+        # ملفات الجلسة الجارية تكبر باستمرار؛ نعيد الفحص دوريًا
+        self.refresh_timer = QTimer()
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(refresh_ms)
+        self.update_channels()
+        self.show_all()
+
+    def update_channels(self):
+        channels = self.store.channels()
+        if self.channel not in channels:
+            self.channel = channels[0] if channels else None
+        if channels != [self.channel_box.itemData(i) for i in range(self.channel_box.count())]:
+            self.channel_box.blockSignals(True)
+            self.channel_box.clear()
+            for name in channels:
+                self.channel_box.addItem(name or "unnamed", name)
+            self.channel_box.blockSignals(False)
+        if self.channel is not None:
+            self.channel_box.setCurrentIndex(channels.index(self.channel))
+        self.channel_box.setEnabled(len(channels) > 1)
+
+    def select_channel(self, index):
+        self.channel = self.channel_box.itemData(index)
+        self.show_all()
+
+    def show_all(self):
+        span = self.store.span(self.channel)
+        if span is None:
+            self.status_label.setText("No tiled sessions yet (python -m storage.tiles builds them for old recordings)")
+            return
+        self.graph.setXRange(*span, padding=0.02)
+        self.fetch()
+
+    def schedule_fetch(self, *_):
+        if not self.fetch_timer.isActive():
+            self.fetch_timer.start(16)
+
+    def fetch(self):
+        began = time.perf_counter()
+        (x_min, x_max), _ = self.graph.getViewBox().viewRange()
+        max_points = max(self.graph.width(), 100)
+        level, times, mins, maxs, means = self.store.query(x_min, x_max, max_points, self.channel)
+        self.min_curve.setData(times, mins)
+        self.max_curve.setData(times, maxs)
+        self.mean_curve.setData(times, means)
+        elapsed = (time.perf_counter() - began) * 1000.0
+        self.status_label.setText(f"{len(self.store.sessions)} sessions   resolution {LEVEL_NAMES.get(level, f'{level} s')}   "
+                                  f"{len(times)} points   fetched in {elapsed:.1f} ms")
+
+    def refresh(self):
+        self.store.refresh()
+        self.update_channels()
+        self.schedule_fetch()
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    viewer = HistoryViewer(sys.argv[1] if len(sys.argv) > 1 else "data")
+    viewer.show()
+    sys.exit(app.exec())
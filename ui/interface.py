@@ -1,20 +1,37 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame
-from PyQt6.QtCore import QTimer, QDateTime, Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import QTimer, QDateTime, Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 from ui.graph_widget import GraphWidget
 from ui.control_buttons import ControlButtons
 from ui.settings_ui import SettingsUI
 from sensors.arduino_reader import ArduinoReader
+from storage.session_recorder import SessionRecorder, analyze_recording
+from storage.catalog import SessionCatalog
+from control.program_runner import ProgramRunner, program_from_config, ARMED, WAITING, HOLDING
 
 class ChocoMonitorUI(QWidget):
-    def __init__(self, arduino_reader):
+    program_event = pyqtSignal(str, int)
+
+    def __init__(self, arduino_reader, config=None, recorder=None):
         super().__init__()
         self.setWindowTitle("ChocoMonitor - Temperature Analyzer")
         self.setGeometry(100, 100, 1280, 720)
         self.setStyleSheet("background-color: #121212; color: white;")
         self.arduino_reader = arduino_reader
+        self.catalog = SessionCatalog()
+        self.channel = getattr(arduino_reader, "name", None) or getattr(arduino_reader, "port", None)
+        # recorder: a sensors.remote.RemoteRecorder when the acquisition daemon owns recording
+        self.recorder = recorder or SessionRecorder(self.arduino_reader.buffer, catalog=self.catalog, channel=self.channel)
+        self.remote_recording = False
+        # البرنامج يبدأ التشغيل عند بلوغ درجة البداية ويوقفه بعد المدة المحددة
+        self.runner = ProgramRunner(self.arduino_reader.buffer, program_from_config(config or {}))
+        # runner events arrive on its thread; the signal delivers them on the GUI thread
+        self.runner.add_listener(self.program_event.emit)
+        self.program_event.connect(self.on_program_event)
+        self.analysis_executor = ThreadPoolExecutor(max_workers=1)
 
         main_layout = QVBoxLayout()
 
@@ -24,12 +41,20 @@ class ChocoMonitorUI(QWidget):
         self.time_label.setFont(QFont("Arial", 18, QFont.Weight.Bold))
         self.top_bar.addWidget(self.time_label)
         self.top_bar.addStretch()
+        self.program_label = QLabel()
+        self.program_label.setFont(QFont("Arial", 14))
+        self.top_bar.addWidget(self.program_label)
+        self.connection_label = QLabel()
+        self.connection_label.setFont(QFont("Arial", 14))
+        self.top_bar.addWidget(self.connection_label)
 
         # Graph Display
         self.graph_frame = QFrame()
         self.graph_frame.setStyleSheet("background-color: #1E1E1E; border-radius: 15px; padding: 10px;")
         self.graph_layout = QVBoxLayout()
-        self.graph_widget = GraphWidget(self.arduino_reader)
+        # "window_seconds": 600 shows only the last 10 minutes; absent shows the whole run
+        self.graph_widget = GraphWidget(self.arduino_reader, window_seconds=(config or {}).get("window_seconds"),
+                                        catalog=self.catalog)
         self.graph_layout.addWidget(self.graph_widget)
         self.graph_frame.setLayout(self.graph_layout)
 
@@ -46,8 +71,14 @@ class ChocoMonitorUI(QWidget):
         self.results_button.setFixedHeight(60)
         self.results_button.clicked.connect(self.open_results)
 
+        self.history_button = QPushButton("📈 History")
+        self.history_button.setStyleSheet("font-size: 20px; padding: 15px; background-color: #2E8B57; color: white; border-radius: 10px;")
+        self.history_button.setFixedHeight(60)
+        self.history_button.clicked.connect(self.open_history)
+
         self.buttons_layout.addWidget(self.buttons_widget)
         self.buttons_layout.addWidget(self.results_button)
+        self.buttons_layout.addWidget(self.history_button)
 
         main_layout.addLayout(self.top_bar)
         main_layout.addWidget(self.graph_frame)
@@ -55,27 +86,120 @@ class ChocoMonitorUI(QWidget):
 
         self.setLayout(main_layout)
 
+        self.metrics_shortcut = QShortcut(QKeySequence("F3"), self)
+        self.metrics_shortcut.activated.connect(self.graph_widget.toggle_metrics_overlay)
+
         # Timer to update time
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_time)
         self.timer.start(1000)
 
+        self.runner.arm()
+        self.follow_remote()
+
     def start_graph(self):
-        self.graph_widget.start_graph()
+        self.begin_run()
+        # a manual start still ends after the programmed duration
+        self.runner.start_now()
 
     def stop_graph(self):
+        self.runner.abort()
+        self.end_run()
+        self.runner.arm()
+
+    def begin_run(self):
+        if not self.graph_widget.running:
+            self.recorder.start()
+        self.graph_widget.start_graph()
+
+    def follow_remote(self):
+        """Track recordings the daemon starts or stops for another client, or ran before this window attached."""
+        if not hasattr(self.recorder, "started_at"):
+            return
+        recording = self.recorder.is_recording()
+        if recording == self.remote_recording:
+            return
+        self.remote_recording = recording
+        if recording and not self.graph_widget.running:
+            # backfill the run so far from the daemon's ring
+            self.graph_widget.start_graph(since=self.recorder.started_at)
+        elif not recording and self.graph_widget.running:
+            self.graph_widget.stop_graph()
+
+    def end_run(self):
+        recording = self.recorder.is_recording()
+        path, thread = self.recorder.path, self.recorder.thread
+        self.recorder.stop()
         self.graph_widget.stop_graph()
+        # no thread: the daemon recorded the session and analyses it itself
+        if recording and thread is not None:
+            self.analysis_executor.submit(analyze_recording, path, thread, self.catalog)
+
+    def prewarm(self):
+        """Import the report and analysis stack in the background once the window is up."""
+        self.graph_widget.prewarm()
+        return self.analysis_executor.submit(self.warm_analysis)
+
+    def warm_analysis(self):
+        import numpy as np
+        from algorithms.data_analysis import DEFAULT_RENDERER
+        from algorithms.curve_analysis import analyze_curve
+        analyze_curve(np.arange(3.0), np.zeros(3))
+        DEFAULT_RENDERER.warm_up("analysis")
+
+    def on_program_event(self, event, step):
+        if event == "started":
+            self.begin_run()
+        elif event in ("finished", "aborted"):
+            if event == "finished":
+                self.end_run()
+            # wait for the next batch; a program applied during the run is swapped in by now
+            self.runner.arm()
+        self.update_program_label()
+
+    def update_program_label(self):
+        runner = self.runner
+        if runner.state not in (ARMED, WAITING, HOLDING):
+            self.program_label.setText("")
+            return
+        step = runner.program[runner.step]
+        progress = f"Step {runner.step + 1}/{len(runner.program)}"
+        if runner.state == HOLDING:
+            minutes, seconds = divmod(int(round(runner.remaining() or 0)), 60)
+            text = f"⏳ {progress} at {step.temperature:g} °C: {minutes:02d}:{seconds:02d} left"
+        elif runner.state == ARMED:
+            text = f"⏳ Starts at {step.temperature:g} °C"
+        else:
+            text = f"⏳ {progress}: waiting for {step.temperature:g} °C"
+        self.program_label.setText(text)
 
     def open_settings(self):
         self.settings_window = SettingsUI(self)
+        self.settings_window.settings_applied.connect(self.apply_program)
         self.settings_window.show()
 
+    def apply_program(self, config):
+        self.runner.set_program(program_from_config(config))
+        self.runner.arm()
+
+    def open_history(self):
+        from ui.history_viewer import HistoryViewer
+        self.history_window = HistoryViewer(self.recorder.data_dir, channel=self.channel)
+        self.history_window.show()
+
     def open_results(self):
         os.startfile(os.path.abspath("results"))
 
     def update_time(self):
         current_time = QDateTime.currentDateTime().toString("dd/MM/yyyy HH:mm")
         self.time_label.setText(current_time)
+        self.update_program_label()
+        self.follow_remote()
+        state = getattr(self.arduino_reader, "state", None)
+        if state:
+            color = "#00FF00" if state == "connected" else "#FF4500"
+            self.connection_label.setText(f"🔌 {state.capitalize()}")
+            self.connection_label.setStyleSheet(f"color: {color};")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,126 @@
+import numpy as np
+
+class DecimatedSeries:
+    """Growable (x, y) series with an incrementally maintained min/max envelope.
+
+    Raw samples live in preallocated arrays that double when full. Alongside them
+    the series keeps min/max per bucket of ``bin_size`` samples; when there are more
+    than ``max_buckets`` buckets, neighbouring pairs are merged and ``bin_size``
+    doubles. Appending is O(new points) and drawing the full history only touches
+    the envelope, so redraw cost stays flat as the run gets longer.
+    x must be non-decreasing (elapsed time).
+    """
+
+    def __init__(self, initial_capacity=4096, max_buckets=8192):
+        self.x = np.empty(initial_capacity, dtype=np.float64)
+        self.y = np.empty(initial_capacity, dtype=np.float64)
+        self.count = 0
+        self.max_buckets = max_buckets
+        self.bin_size = 1
+        self.env_x = np.empty(max_buckets + 1, dtype=np.float64)
+        self.env_min = np.empty(max_buckets + 1, dtype=np.float64)
+        self.env_max = np.empty(max_buckets + 1, dtype=np.float64)
+        self.buckets = 0  # complete buckets in the envelope
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.bin_size = 1
+        self.buckets = 0
+
+    def xs(self):
+        return self.x[:self.count]
+
+    def ys(self):
+        return self.y[:self.count]
+
+    def append(self, xs, ys):
+        n = len(ys)
+        if n == 0:
+            return
+        needed = self.count + n
+        if needed > len(self.x):
+            capacity = max(needed, 2 * len(self.x))
+            self.x = np.resize(self.x, capacity)
+            self.y = np.resize(self.y, capacity)
+        self.x[self.count:needed] = xs
+        self.y[self.count:needed] = ys
+        self.count = needed
+        self._extend_envelope()
+
+    def _extend_envelope(self):
+        while True:
+            start = self.buckets * self.bin_size
+            full = (self.count - start) // self.bin_size
+            if self.buckets + full <= self.max_buckets:
+                break
+            self._merge_buckets()
+        if full == 0:
+            return
+        end = start + full * self.bin_size
+        block = self.y[start:end].reshape(full, self.bin_size)
+        b = self.buckets
+        self.env_x[b:b + full] = self.x[start:end:self.bin_size]
+        self.env_min[b:b + full] = block.min(axis=1)
+        self.env_max[b:b + full] = block.max(axis=1)
+        self.buckets += full
+
+    def _merge_buckets(self):
+        pairs = self.buckets // 2
+        self.env_x[:pairs] = self.env_x[0:2 * pairs:2]
+        self.env_min[:pairs] = np.minimum(self.env_min[0:2 * pairs:2], self.env_min[1:2 * pairs:2])
+        self.env_max[:pairs] = np.maximum(self.env_max[0:2 * pairs:2], self.env_max[1:2 * pairs:2])
+        self.buckets = pairs
+        self.bin_size *= 2
+
+    def view(self, x_min=None, x_max=None, max_points=2000):
+        """Points to draw for [x_min, x_max] at roughly ``max_points`` resolution.
+
+        Returns raw samples when few enough fall in range, otherwise a min/max
+        pair per bucket so spikes survive decimation.
+        """
+        x = self.x[:self.count]
+        lo = 0 if x_min is None else int(np.searchsorted(x, x_min, side='left'))
+        hi = self.count if x_max is None else int(np.searchsorted(x, x_max, side='right'))
+        # keep one point either side so lines run to the edge of the view
+        lo, hi = max(lo - 1, 0), min(hi + 1, self.count)
+        n = hi - lo
+        if n <= max_points:
+            return x[lo:hi], self.y[lo:hi]
+        buckets_in_range = n // self.bin_size
+        if buckets_in_range >= max_points // 4:
+            b_lo, b_hi = lo // self.bin_size, min(hi // self.bin_size, self.buckets)
+            ex, emin, emax = self.env_x[b_lo:b_hi], self.env_min[b_lo:b_hi], self.env_max[b_lo:b_hi]
+            tail_start = b_hi * self.bin_size
+            if tail_start < hi:
+                ex = np.append(ex, x[tail_start])
+                emin = np.append(emin, self.y[tail_start:hi].min())
+                emax = np.append(emax, self.y[tail_start:hi].max())
+            return min_max_decimate(ex, emin, emax, max_points // 2)
+        y = self.y[lo:hi]
+        return min_max_decimate(x[lo:hi], y, y, max_points // 2)
+
+
+def min_max_decimate(x, y_min, y_max, buckets):
+    """Collapse a series to at most ``buckets`` (min, max) pairs, interleaved for drawing."""
+    n = len(x)
+    if n <= buckets:
+        step = 1
+    else:
+        step = -(-n // buckets)
+    full = n // step
+    head = full * step
+    xs = x[:head:step]
+    mins = y_min[:head].reshape(full, step).min(axis=1)
+    maxs = y_max[:head].reshape(full, step).max(axis=1)
+    if head < n:
+        xs = np.append(xs, x[head])
+        mins = np.append(mins, y_min[head:].min())
+        maxs = np.append(maxs, y_max[head:].max())
+    out_x = np.repeat(xs, 2)
+    out_y = np.empty(len(out_x), dtype=np.float64)
+    out_y[0::2] = mins
+    out_y[1::2] = maxs
+    return out_x, out_y
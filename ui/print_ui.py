@@ -1,10 +1,18 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QGridLayout, QFrame, QScrollArea, QHBoxLayout, QListWidget
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QListWidget, QListView
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from ui.results_browser import ResultsIndex, ThumbnailModel, THUMBNAIL_SIZE, thumbnail_grid_size
+from storage.catalog import SessionCatalog
+
+log = logging.getLogger(__name__)
 
 class PrintUI(QWidget):
+    folders_imported = pyqtSignal()
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
@@ -30,17 +38,28 @@ class PrintUI(QWidget):
         self.folder_list.itemClicked.connect(self.load_images)
         content_layout.addWidget(self.folder_list)
 
-        # Image grid
-        self.image_grid = QGridLayout()
-        self.image_container = QWidget()
-        self.image_container.setLayout(self.image_grid)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.image_container)
-        content_layout.addWidget(self.scroll_area)
-
         # Load folders dynamically based on project directory
         self.results_directory = os.path.join(os.getcwd(), "results")
+        self.results_index = ResultsIndex(self.results_directory)
+        # الأيام والصور تأتي من فهرس الجلسات بدل فحص المجلدات
+        self.catalog = SessionCatalog()
+        self.import_executor = ThreadPoolExecutor(max_workers=1)
+        self.folders_imported.connect(self.show_folders)
+
+        # Image grid: the view only asks the model for cells on screen, so thumbnails
+        # are decoded lazily in a thread pool and cached on disk
+        self.thumbnail_model = ThumbnailModel(self.results_index, self)
+        self.image_view = QListView()
+        self.image_view.setViewMode(QListView.ViewMode.IconMode)
+        self.image_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.image_view.setMovement(QListView.Movement.Static)
+        self.image_view.setUniformItemSizes(True)
+        self.image_view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.image_view.setGridSize(thumbnail_grid_size())
+        self.image_view.setModel(self.thumbnail_model)
+        self.image_view.clicked.connect(lambda index: self.display_full_image(index.data(ThumbnailModel.PathRole)))
+        content_layout.addWidget(self.image_view)
+
         self.load_folders()
 
         # Back Button
@@ -52,32 +71,31 @@ class PrintUI(QWidget):
         self.setLayout(layout)
 
     def load_folders(self):
-        if not os.path.exists(self.results_directory):
-            return
+        """List the catalogued days now, then pick up anything new on disk in the background."""
+        self.show_folders()
+        self.import_executor.submit(self.import_folders)
+
+    def import_folders(self):
+        # يعمل في الخلفية؛ الملفات المعروفة تُتخطى والتحليل يبقى لمحلل الدفعات
+        try:
+            self.catalog.import_tree("data", self.results_directory, analyze=False)
+        except Exception as e:
+            log.error("❌ Could not import %s into the catalog: %s", self.results_directory, e)
+        self.folders_imported.emit()
+
+    def show_folders(self):
+        current = self.folder_list.currentItem()
+        selected = current.text() if current else None
         self.folder_list.clear()
-        for folder in sorted(os.listdir(self.results_directory)):
-            folder_path = os.path.join(self.results_directory, folder)
-            if os.path.isdir(folder_path):
-                self.folder_list.addItem(folder)
+        # one entry per day, whether its folder is named 2025-01-29 or 23.01.2025
+        for day in self.catalog.report_days():
+            self.folder_list.addItem(day)
+            if day == selected:
+                self.folder_list.setCurrentRow(self.folder_list.count() - 1)
+                self.load_images(self.folder_list.currentItem())
 
     def load_images(self, item):
-        folder_name = item.text()
-        directory = os.path.join(self.results_directory, folder_name)
-        for i in reversed(range(self.image_grid.count())):
-            self.image_grid.itemAt(i).widget().setParent(None)
-        row, col = 0, 0
-        for filename in sorted(os.listdir(directory)):
-            if filename.endswith(".png"):
-                image_path = os.path.join(directory, filename)
-                pixmap = QPixmap(image_path).scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                image_label = QLabel()
-                image_label.setPixmap(pixmap)
-                image_label.mousePressEvent = lambda event, path=image_path: self.display_full_image(path)
-                self.image_grid.addWidget(image_label, row, col)
-                col += 1
-                if col > 3:
-                    col = 0
-                    row += 1
+        self.thumbnail_model.set_images(self.catalog.reports(item.text()))
 
     def display_full_image(self, image_path):
         self.full_image_window = QWidget()
@@ -0,0 +1,121 @@
+import os
+import hashlib
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap, QColor
+
+THUMBNAIL_SIZE = 200
+
+class ResultsIndex:
+    """Thumbnail cache for the result images listed by storage.catalog.SessionCatalog.
+
+    Thumbnails are cached as small PNGs named after a hash of (path, mtime,
+    size): editing or replacing an image gives it a new key, and stale
+    thumbnails are simply never read again.
+    """
+
+    def __init__(self, results_dir, thumb_size=THUMBNAIL_SIZE):
+        self.results_dir = results_dir
+        self.thumb_size = thumb_size
+        self.cache_dir = os.path.join(results_dir, ".thumbnails")
+
+    def thumbnail_path(self, path, mtime, size):
+        key = hashlib.blake2b(f"{os.path.abspath(path)}|{mtime}|{size}|{self.thumb_size}".encode(),
+                              digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, key + ".png")
+
+class ThumbnailSignals(QObject):
+    loaded = pyqtSignal(int, str, QImage)
+
+class ThumbnailTask(QRunnable):
+    """Loads one thumbnail from the disk cache, or decodes and caches it. Runs in QThreadPool."""
+
+    def __init__(self, results_index, generation, path, mtime, size, signals):
+        super().__init__()
+        self.results_index = results_index
+        self.generation = generation
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        cache_path = self.results_index.thumbnail_path(self.path, self.mtime, self.size)
+        image = QImage(cache_path) if os.path.exists(cache_path) else QImage()
+        if image.isNull():
+            reader = QImageReader(self.path)
+            source = reader.size()
+            if source.isValid():
+                # يفك الترميز مباشرة بالحجم المصغر بدل تحميل الصورة كاملة ثم تصغيرها
+                reader.setScaledSize(source.scaled(self.results_index.thumb_size, self.results_index.thumb_size,
+                                                   Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if image.isNull():
+                return
+            os.makedirs(self.results_index.cache_dir, exist_ok=True)
+            image.save(cache_path, "PNG")
+        self.signals.loaded.emit(self.generation, self.path, image)
+
+class ThumbnailModel(QAbstractListModel):
+    """List model that asks for a thumbnail only when a view requests a visible cell."""
+
+    PathRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, results_index, parent=None):
+        super().__init__(parent)
+        self.results_index = results_index
+        self.images = []
+        self.rows = {}
+        self.pixmaps = {}
+        self.pending = set()
+        self.generation = 0
+        self.pool = QThreadPool()
+        self.signals = ThumbnailSignals()
+        self.signals.loaded.connect(self.on_loaded)
+        self.placeholder = QPixmap(results_index.thumb_size, results_index.thumb_size)
+        self.placeholder.fill(QColor("#1E1E1E"))
+
+    def set_images(self, images):
+        """Show ``images``, a list of (path, mtime_ns, size) such as SessionCatalog.reports() returns."""
+        self.pool.clear()
+        self.beginResetModel()
+        self.generation += 1
+        self.images = images
+        self.rows = {image[0]: row for row, image in enumerate(self.images)}
+        self.pixmaps = {}
+        self.pending = set()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.images)
+
+    def data(self, model_index, role=Qt.ItemDataRole.DisplayRole):
+        if not model_index.isValid():
+            return None
+        path, mtime, size = self.images[model_index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(path)
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self.pixmaps.get(path)
+            if pixmap is None:
+                if path not in self.pending:
+                    self.pending.add(path)
+                    self.pool.start(ThumbnailTask(self.results_index, self.generation, path, mtime, size, self.signals))
+                return self.placeholder
+            return pixmap
+        if role == self.PathRole:
+            return path
+        return None
+
+    def on_loaded(self, generation, path, image):
+        if generation != self.generation or path not in self.rows:
+            return
+        self.pending.discard(path)
+        self.pixmaps[path] = QPixmap.fromImage(image)
+        row = self.index_for(path)
+        self.dataChanged.emit(row, row, [Qt.ItemDataRole.DecorationRole])
+
+    def index_for(self, path):
+        return self.createIndex(self.rows[path], 0)
+
+def thumbnail_grid_size(thumb_size=THUMBNAIL_SIZE):
+    return QSize(thumb_size + 20, thumb_size + 40)
@@ -37,17 +37,32 @@ class SettingsUI(QDialog):
         try:
             with open("config.json", "r") as file:
                 settings = json.load(file)
-                self.temp_input.setValue(settings.get("start_temperature", 30))
-                self.duration_input.setValue(settings.get("duration", 5))
         except (FileNotFoundError, json.JSONDecodeError):
-            pass
+            return
+        # مع برنامج متعدد الخطوات يعدّل الحوار الخطوة الأولى
+        if settings.get("program"):
+            first = settings["program"][0]
+            settings = {"start_temperature": first["temperature"], "duration": first["duration"]}
+        self.temp_input.setValue(int(settings.get("start_temperature", 30)))
+        self.duration_input.setValue(int(settings.get("duration", 5)))
 
     def apply_settings(self):
         settings = {
             "start_temperature": self.temp_input.value(),
             "duration": self.duration_input.value()
         }
+        # keep keys this dialog does not edit (ports, channel, ...)
+        try:
+            with open("config.json", "r") as file:
+                config = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            config = {}
+        if config.get("program"):
+            config["program"][0].update(temperature=settings["start_temperature"], duration=settings["duration"])
+        else:
+            config.update(settings)
         with open("config.json", "w") as file:
-            json.dump(settings, file, indent=4)
-        self.settings_applied.emit(settings)
+            json.dump(config, file, indent=4)
+        # the saved config, so the running program is the one the next launch loads
+        self.settings_applied.emit(config)
         self.close()